@@ -0,0 +1,261 @@
+# benchmarks/run.py - Headless-Benchmarks der heißen Pfade mit Vergleich gegen eine gespeicherte Baseline
+#
+#   python -m benchmarks.run                          # Standardgrößen 10^3..10^5
+#   python -m benchmarks.run --sizes 1000,1000000     # bis 10^6 Boxen
+#   python -m benchmarks.run --save-baseline          # aktuelle Werte als Baseline speichern
+#   python -m benchmarks.run --ci                     # fehlende Baseline ist ein Fehler (Exit-Code 1)
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # kein Display nötig
+
+import numpy as np
+from PyQt5.QtCore import QPoint
+
+from benchmarks.synthetic import make_project, make_raw, make_tracks, make_video, StubModel
+from labeling.label_manager import LabelManager
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+# --- Fälle: case(size, workdir) -> (zu messende Funktion, Anzahl Elemente pro Aufruf) ---
+
+def case_project_save_json(size, workdir):
+    manager = make_project(LabelManager(), size)
+    path = os.path.join(workdir, f"project_{size}.json")
+    return lambda: manager.save_project(path), size
+
+
+def case_project_load_json(size, workdir):
+    path = os.path.join(workdir, f"project_{size}.json")
+    make_project(LabelManager(), size).save_project(path)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            LabelManager().load_project(path)
+    return run, size
+
+
+def case_project_save_sqlite(size, workdir):
+    manager = make_project(LabelManager(), size)
+    path = os.path.join(workdir, f"project_{size}.db")
+    return lambda: manager.save_project(path), size
+
+
+def case_project_load_sqlite(size, workdir):
+    # Laden ist lazy → alle Frames einmal anfassen, sonst misst man nur den Frame-Index
+    path = os.path.join(workdir, f"project_load_{size}.db")
+    make_project(LabelManager(), size).save_project(path)
+
+    def run():
+        manager = LabelManager()
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager.load_project(path)
+        for frame_index in manager.frame_indices():
+            manager.get_shapes(frame_index)
+        manager.close()
+    return run, size
+
+
+def case_hit_test(size, workdir):
+    # Alle Boxen in einem Frame (Worst Case), 1000 Mauspositionen
+    boxes = min(size, 10_000)
+    manager = make_project(LabelManager(), boxes, boxes_per_frame=boxes)
+    rng = np.random.default_rng(1)
+    points = [QPoint(int(x), int(y)) for x, y in zip(rng.integers(0, 1920, 1000), rng.integers(0, 1080, 1000))]
+    manager.find_shape_border_hit(0, points[0])  # Raster einmal aufbauen
+
+    def run():
+        for point in points:
+            manager.find_shape_border_hit(0, point)
+            manager.find_corner_hit(0, point)
+    return run, len(points)
+
+
+def case_detect_postprocess(size, workdir):
+    from detection.yolo8_wrapper import YOLOv8Detector
+    candidates = min(size, 100_000)
+    detector = YOLOv8Detector("stub", model=StubModel())
+    raw = make_raw(candidates)
+    return lambda: detector.filter_raw(raw), candidates
+
+
+def case_detect_stub(size, workdir):
+    # Kompletter detect()-Pfad ohne echtes Modell: Ergebnis-Konvertierung + Filter, 32 Frames
+    from detection.yolo8_wrapper import YOLOv8Detector
+    detector = YOLOv8Detector("stub", model=StubModel())
+    frames = [np.zeros((720, 1280, 3), dtype=np.uint8)] * 32
+    return lambda: detector.detect_batch(frames), len(frames)
+
+
+def case_tracker_format(size, workdir):
+    from tracking.deep_sort import DeepSortTracker
+    count = min(size, 10_000)
+    detections = [
+        {"label": "car", "confidence": 0.9, "box": tuple(box)}
+        for box in make_raw(count)["xyxy"].astype(int).tolist()
+    ]
+    tracks = make_tracks(count)
+
+    def run():
+        DeepSortTracker.format_detections(detections)
+        DeepSortTracker.format_tracks(tracks)
+    return run, count
+
+
+def case_frame_seek(size, workdir):
+    # Stellvertreter für TrainingWindow.load_frame: misst nur FrameSource.get_frame bei wahlfreien
+    # Sprüngen (ohne Cache-Treffer) – Proxy-Store, Rendering und Qt-Anzeige sind nicht enthalten
+    from video.frame_source import FrameSource
+    from video.video_index import VideoIndex
+    path = os.path.join(workdir, "synthetic.mp4")
+    if not os.path.exists(path):
+        make_video(path)
+    index = VideoIndex.build(path)
+    targets = np.random.default_rng(2).integers(0, index.frame_count, 40).tolist()
+
+    def run():
+        source = FrameSource(path, cache_mb=1, prefetch_ahead=0, prefetch_behind=0, index=index)
+        for target in targets:
+            source.get_frame(target, prefetch=False)
+        source.close()
+    return run, len(targets)
+
+
+def case_frame_sequential(size, workdir):
+    from video.frame_source import FrameSource
+    from video.video_index import VideoIndex
+    path = os.path.join(workdir, "synthetic.mp4")
+    if not os.path.exists(path):
+        make_video(path)
+    index = VideoIndex.build(path)
+
+    def run():
+        source = FrameSource(path, cache_mb=1, prefetch_ahead=0, prefetch_behind=0, index=index)
+        for frame_index in range(index.frame_count):
+            source.get_frame(frame_index, prefetch=False)
+        source.close()
+    return run, index.frame_count
+
+
+# name -> (Funktion, skaliert mit --sizes?)
+CASES = {
+    "project_save_json": (case_project_save_json, True),
+    "project_load_json": (case_project_load_json, True),
+    "project_save_sqlite": (case_project_save_sqlite, True),
+    "project_load_sqlite": (case_project_load_sqlite, True),
+    "hit_test": (case_hit_test, True),
+    "detect_postprocess": (case_detect_postprocess, True),
+    "detect_stub": (case_detect_stub, False),
+    "tracker_format": (case_tracker_format, True),
+    "frame_seek": (case_frame_seek, False),
+    "frame_sequential": (case_frame_sequential, False),
+}
+
+
+def measure(fn, repeat: int) -> float:
+    """Median der Laufzeiten in Sekunden (ein Aufwärmlauf vorneweg)."""
+    fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run_cases(names, sizes, repeat, workdir):
+    results = {}
+    for name in names:
+        case, scaled = CASES[name]
+        for size in (sizes if scaled else [None]):
+            key = name if size is None else f"{name}[{size}]"
+            try:
+                fn, items = case(size or 0, workdir)
+                seconds = measure(fn, repeat)
+            except Exception as e:
+                print(f"❌ {key}: {type(e).__name__}: {e}")
+                continue
+            results[key] = {
+                "seconds": seconds,
+                "items": items,
+                "us_per_item": seconds / max(items, 1) * 1e6,
+                "items_per_s": items / seconds if seconds > 0 else float("inf"),
+            }
+            print(f"   {key:<32} {seconds * 1000:10.2f} ms  {results[key]['us_per_item']:10.2f} µs/Element"
+                  f"  {results[key]['items_per_s']:14,.0f} /s")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Liefert die Schlüssel, die mehr als tolerance langsamer sind als die Baseline."""
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get("results", {}).get(key)
+        if reference is None:
+            continue
+        ratio = result["seconds"] / reference["seconds"] if reference["seconds"] > 0 else 1.0
+        marker = "❌" if ratio > 1 + tolerance else "✅"
+        print(f"   {marker} {key:<32} {ratio:6.2f}x der Baseline")
+        if ratio > 1 + tolerance:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless-Benchmarks für Labeling, Persistenz und Inferenz.")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES), help="Anzahl Boxen, kommagetrennt")
+    parser.add_argument("--only", default=None, help=f"Kommagetrennte Auswahl aus {', '.join(CASES)}")
+    parser.add_argument("--repeat", type=int, default=3, help="Messläufe pro Fall (Median)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline-JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="Ergebnisse als neue Baseline speichern")
+    parser.add_argument("--ci", action="store_true", help="Ohne Baseline mit Fehler abbrechen statt nur zu messen")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Erlaubte Verlangsamung (0.25 = +25%%)")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    names = [n.strip() for n in args.only.split(",")] if args.only else list(CASES)
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        parser.error(f"Unbekannte Fälle: {', '.join(unknown)}")
+
+    print(f"▶️ Benchmarks: {len(names)} Fälle, Größen {sizes}, {args.repeat} Wiederholungen")
+    with tempfile.TemporaryDirectory(prefix="label_helper_bench_") as workdir:
+        results = run_cases(names, sizes, args.repeat, workdir)
+
+    if args.save_baseline:
+        data = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+        with open(args.baseline, "w") as f:
+            json.dump(data, f, indent=4)
+        print(f"✅ Baseline gespeichert unter {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        if args.ci:
+            print(f"❌ Keine Baseline unter {args.baseline} – ohne Baseline gibt es keinen Regressionsvergleich.")
+            sys.exit(1)
+        print(f"ℹ️ Keine Baseline unter {args.baseline} – mit --save-baseline anlegen.")
+        return
+
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)
+    print(f"ℹ️ Vergleich mit {args.baseline} (Toleranz +{args.tolerance:.0%})")
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"❌ {len(regressions)} Regression(en): {', '.join(regressions)}")
+        sys.exit(1)
+    print("✅ Keine Regressionen")
+
+
+if __name__ == "__main__":
+    main()
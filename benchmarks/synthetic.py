@@ -0,0 +1,124 @@
+# benchmarks/synthetic.py - Synthetische Projekte, Videos und ein Stub-Modell für die Benchmarks
+
+import cv2
+import numpy as np
+from PyQt5.QtCore import QRect
+
+from labeling.models import Box
+
+LABELS = ["person", "car", "truck", "bus", "motorbike"]
+
+
+def random_boxes(rng, n: int, width: int = 1920, height: int = 1080):
+    """n zufällige Boxen (x1, y1, x2, y2) als int-Array."""
+    w = rng.integers(20, 200, n)
+    h = rng.integers(20, 200, n)
+    x1 = rng.integers(0, width - 200, n)
+    y1 = rng.integers(0, height - 200, n)
+    return np.stack([x1, y1, x1 + w, y1 + h], axis=1)
+
+
+def make_project(manager, n_boxes: int, boxes_per_frame: int = 20, seed: int = 0):
+    """Füllt einen LabelManager mit n_boxes Boxen, verteilt auf n_boxes / boxes_per_frame Frames."""
+    rng = np.random.default_rng(seed)
+    boxes = random_boxes(rng, n_boxes).tolist()
+    labels = rng.integers(0, len(LABELS), n_boxes).tolist()
+    color = (0, 255, 0)
+
+    for i, ((x1, y1, x2, y2), label_idx) in enumerate(zip(boxes, labels)):
+        label = LABELS[label_idx]
+        shape_id = i + 1
+        manager.frames.setdefault(i // boxes_per_frame, []).append(
+            Box(QRect(x1, y1, x2 - x1, y2 - y1), label, shape_id, color)
+        )
+        manager.label_counters[label] = shape_id
+    return manager
+
+
+def make_raw(n: int, num_classes: int = 80, seed: int = 0) -> dict:
+    """Rohausgabe im Format von YOLOv8Detector.detect_raw() mit n Kandidaten."""
+    rng = np.random.default_rng(seed)
+    return {
+        "xyxy": random_boxes(rng, n).astype(np.float32),
+        "conf": rng.random(n, dtype=np.float32),
+        "cls": rng.integers(0, num_classes, n).astype(np.int32),
+    }
+
+
+class StubTensor:
+    """Nachbau der torch-Aufrufkette .cpu().numpy()."""
+
+    def __init__(self, array):
+        self.array = array
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self.array
+
+
+class StubBoxes:
+    def __init__(self, raw):
+        self.xyxy = StubTensor(raw["xyxy"])
+        self.conf = StubTensor(raw["conf"])
+        self.cls = StubTensor(raw["cls"].astype(np.float32))
+
+
+class StubResult:
+    def __init__(self, raw):
+        self.boxes = StubBoxes(raw)
+
+
+class StubModel:
+    """Ersetzt die YOLO-Gewichte: liefert pro Frame feste Zufallskandidaten, ohne zu rechnen."""
+
+    def __init__(self, candidates: int = 300, num_classes: int = 80, seed: int = 0):
+        self.names = {i: LABELS[i] if i < len(LABELS) else f"class_{i}" for i in range(num_classes)}
+        self.raw = make_raw(candidates, num_classes, seed)
+
+    def predict(self, source, conf=0.25, verbose=False):
+        frames = source if isinstance(source, list) else [source]
+        keep = self.raw["conf"] >= conf
+        raw = {key: value[keep] for key, value in self.raw.items()}
+        return [StubResult(raw) for _ in frames]
+
+
+class FakeTrack:
+    """Minimaler DeepSort-Track für DeepSortTracker.format_tracks()."""
+
+    def __init__(self, track_id, ltrb, label, confirmed=True):
+        self.track_id = track_id
+        self.ltrb = ltrb
+        self.label = label
+        self.confirmed = confirmed
+
+    def is_confirmed(self):
+        return self.confirmed
+
+    def to_ltrb(self):
+        return self.ltrb
+
+    def get_det_class(self):
+        return self.label
+
+
+def make_tracks(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    boxes = random_boxes(rng, n).astype(np.float64)
+    return [FakeTrack(str(i), box, LABELS[i % len(LABELS)], confirmed=i % 5 != 0) for i, box in enumerate(boxes)]
+
+
+def make_video(path: str, frames: int = 300, size=(1280, 720), fps: float = 30.0):
+    """Kurzes Testvideo: bewegtes Rechteck plus Frame-Nummer, damit jeder Frame anders ist."""
+    width, height = size
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+    background = np.random.default_rng(0).integers(0, 60, (height, width, 3), dtype=np.uint8)
+    for i in range(frames):
+        frame = background.copy()
+        x = (i * 7) % (width - 100)
+        cv2.rectangle(frame, (x, height // 3), (x + 100, height // 3 + 150), (0, 200, 255), -1)
+        cv2.putText(frame, str(i), (20, 60), cv2.FONT_HERSHEY_SIMPLEX, 2, (255, 255, 255), 3)
+        writer.write(frame)
+    writer.release()
+    return path
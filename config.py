@@ -6,4 +6,57 @@ OUTPUT_FOLDER = "data/output/"
 SUPPORTED_FORMATS = ('.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv', '.webm')
 
 # Nur für manuelle Auswahl in der Oberfläche
-MANUAL_LABEL_OPTIONS = ["person", "car", "truck", "bus", "motorbike"]
\ No newline at end of file
+MANUAL_LABEL_OPTIONS = ["person", "car", "truck", "bus", "motorbike"]
+
+# Frame-Cache für die Navigation im Training-Interface
+FRAME_CACHE_MB = 512
+PREFETCH_AHEAD = 16   # Frames, die vorausdekodiert werden
+PREFETCH_BEHIND = 4   # Frames, die rückwärts vorgehalten werden
+
+# Persistenter Cache für rohe YOLO-Ausgaben (pro Video + Modell)
+DETECTION_CACHE_FOLDER = "data/cache/detections/"
+
+# DeepSort-Checkpoints für Sprünge im Video (alle N Frames ein Snapshot)
+TRACKER_CHECKPOINT_INTERVAL = 30
+
+# Video-Index (Metadaten + Keyframes) pro Video-Inhalt
+VIDEO_INDEX_FOLDER = "data/cache/index/"
+
+# Proxy-Frames (verkleinert, memory-mapped) für schnelles Navigieren
+PROXY_FOLDER = "data/cache/proxy/"
+# längste Seite in Pixeln; muss die Standardansicht abdecken (Fensterbreite 1200 → Bild ~1060 px breit),
+# sonst wird bei jedem Schritt wieder das Vollbild dekodiert
+PROXY_MAX_SIDE = 1280
+
+# Detection-Scheduler: YOLO nur alle N Frames oder bei Bewegung, dazwischen sagt der Tracker voraus
+DETECTION_STRIDE = 5       # 1 = jeder Frame; muss unter max_age des Trackers (30) bleiben
+MOTION_THRESHOLD = 0.02    # mittlere Grauwert-Differenz (0..1) seit der letzten Detektion
+
+# Duplikat-Läufe (nahezu identische Frames) für Navigation, Detection-Wiederverwendung und Export
+DUPLICATE_FOLDER = "data/cache/duplicates/"
+DUPLICATE_THRESHOLD = 0.04     # max. Abweichung eines Mini-Pixels (0..1) zum ersten Frame des Laufs
+EXPORT_THIN_DUPLICATES = False # beim Export pro Duplikat-Lauf nur einen Frame schreiben
+
+# Instrumentierung (Spans um Dekodieren, YOLO, Tracking, Zeichnen); auch per LABEL_HELPER_TRACE=1
+TRACE_ENABLED = False
+TRACE_WINDOW = 100           # Messwerte pro Stufe für Median/p95 in der Statusleiste
+TRACE_MAX_EVENTS = 200_000   # Ringpuffer für den Chrome-Trace
+TRACE_FILE = "data/output/trace.json"
+
+# Start des Training-Interface: Modelle laden im Hintergrund, erster Frame soll vorher sichtbar sein
+DETECTOR_MODEL = "yolov8n.pt"
+STARTUP_BUDGET_MS = 1500  # Zeit bis zum ersten sichtbaren Frame
+
+# Inferenz-Backend des Detektors (CPU): "torch", "onnx" oder "openvino"
+DETECTOR_BACKEND = "torch"
+DETECTOR_INT8 = False      # int8-Quantisierung beim Export (nur onnx/openvino)
+DETECTOR_THREADS = None    # CPU-Threads für die Inferenz, None = Voreinstellung des Backends
+DETECTOR_EXPORT_FOLDER = "data/cache/models/"  # exportierte Modelle, einmal pro Gewichte/Format/int8
+
+# ROI-Detektion (feste Kamera): mit bestätigten Tracks nur Ausschnitte um deren Vorhersage + Einfahrtszonen
+ROI_ENABLED = False
+ROI_REFRESH_INTERVAL = 30  # spätestens alle N Frames ein Vollbild-Durchlauf (neue Objekte außerhalb der Zonen)
+ROI_PADDING = 0.5          # Rand um jede vorhergesagte Box, relativ zu ihrer längeren Seite
+ROI_MIN_SIZE = 128         # Mindestkantenlänge eines Ausschnitts in Pixeln
+ROI_MAX_AREA = 0.5         # decken die Ausschnitte mehr als diesen Bildanteil ab → Vollbild
+ROI_ENTRY_ZONES = []       # [(x1, y1, x2, y2), ...] relativ zur Bildgröße (0..1), z.B. Bildränder mit Zufahrt
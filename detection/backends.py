@@ -0,0 +1,391 @@
+# detection/backends.py - Austauschbare Inferenz-Backends (PyTorch, ONNX Runtime, OpenVINO) für YOLOv8
+#
+#   python -m detection.backends --video clip.mp4 --backend onnx --int8   # Parity-Check gegen PyTorch
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from detection.detection_cache import model_key
+
+BACKENDS = ("torch", "onnx", "openvino")
+EXPORT_FORMATS = {"onnx": "onnx", "openvino": "openvino"}
+
+
+def backend_variant(name: str, int8: bool = False) -> str:
+    """Kürzel für Cache-Schlüssel; torch bleibt leer, damit bestehende Detection-Caches gültig bleiben."""
+    if name == "torch":
+        return ""
+    return f"-{name}" + ("-int8" if int8 else "")
+
+
+# --- gemeinsame Vor- und Nachverarbeitung für die exportierten Modelle ---
+
+def letterbox(frame: np.ndarray, size: int = 640, fill: int = 114):
+    """Seitenverhältnis-treu auf size x size skalieren und zentriert auffüllen → (Bild, ratio, (pad_x, pad_y))."""
+    h, w = frame.shape[:2]
+    ratio = min(size / h, size / w)
+    new_w, new_h = int(round(w * ratio)), int(round(h * ratio))
+    pad_x, pad_y = (size - new_w) / 2, (size - new_h) / 2
+
+    resized = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR) if (new_w, new_h) != (w, h) else frame
+    top, left = int(round(pad_y - 0.1)), int(round(pad_x - 0.1))
+    bottom, right = size - new_h - top, size - new_w - left
+    image = cv2.copyMakeBorder(resized, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(fill, fill, fill))
+    return image, ratio, (left, top)
+
+
+def to_blob(image: np.ndarray) -> np.ndarray:
+    # Wie ultralytics bei numpy-Eingaben: Kanäle drehen, HWC → NCHW, 0..1
+    return np.ascontiguousarray(image[..., ::-1].transpose(2, 0, 1)[None], dtype=np.float32) / 255.0
+
+
+def nms(boxes: np.ndarray, scores: np.ndarray, iou_thresh: float) -> np.ndarray:
+    """Greedy-NMS auf xyxy-Boxen; liefert die Indizes der behaltenen Boxen (absteigend nach Score)."""
+    x1, y1, x2, y2 = boxes.T
+    areas = (x2 - x1).clip(0) * (y2 - y1).clip(0)
+    order = scores.argsort()[::-1]
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        w = (np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest])).clip(0)
+        h = (np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest])).clip(0)
+        inter = w * h
+        iou = inter / (areas[i] + areas[rest] - inter + 1e-9)
+        order = rest[iou <= iou_thresh]
+    return np.asarray(keep, dtype=np.int64)
+
+
+def postprocess(output: np.ndarray, ratio: float, pad, frame_shape, conf: float,
+                iou_thresh: float = 0.7, max_det: int = 300) -> dict:
+    """YOLOv8-Kopf (1, 4 + klassen, anker) → Rohformat {"xyxy", "conf", "cls"} in Frame-Koordinaten."""
+    pred = output[0].T  # (anker, 4 + klassen)
+    scores = pred[:, 4:]
+    cls = scores.argmax(axis=1)
+    best = scores[np.arange(len(cls)), cls]
+    keep = best >= conf
+    pred, cls, best = pred[keep], cls[keep], best[keep]
+
+    cx, cy, w, h = pred[:, 0], pred[:, 1], pred[:, 2], pred[:, 3]
+    xyxy = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+
+    # Klassenweise NMS in einem Durchlauf: Boxen verschiedener Klassen per Offset trennen
+    offsets = cls[:, None].astype(np.float32) * 7680.0
+    order = nms(xyxy + offsets, best, iou_thresh)[:max_det]
+    xyxy, best, cls = xyxy[order], best[order], cls[order]
+
+    xyxy[:, [0, 2]] -= pad[0]
+    xyxy[:, [1, 3]] -= pad[1]
+    xyxy /= ratio
+    height, width = frame_shape[:2]
+    xyxy[:, [0, 2]] = xyxy[:, [0, 2]].clip(0, width)
+    xyxy[:, [1, 3]] = xyxy[:, [1, 3]].clip(0, height)
+    return {"xyxy": xyxy.astype(np.float32), "conf": best.astype(np.float32), "cls": cls.astype(np.int32)}
+
+
+# --- Export mit Cache ---
+
+def calibration_reader(frames, imgsz: int, input_name: str):
+    """CalibrationDataReader für quantize_static: dieselbe Vorverarbeitung wie zur Laufzeit."""
+    from onnxruntime.quantization import CalibrationDataReader
+
+    class FrameReader(CalibrationDataReader):
+        def __init__(self):
+            self.blobs = iter([to_blob(letterbox(frame, imgsz)[0]) for frame in frames])
+
+        def get_next(self):
+            blob = next(self.blobs, None)
+            return None if blob is None else {input_name: blob}
+
+    return FrameReader()
+
+
+def export_model(model_path: str, fmt: str, cache_dir: str, imgsz: int = 640, int8: bool = False,
+                 int8_data: str = "coco128.yaml", calibration: str | None = None, calibration_frames: int = 64):
+    """Exportiert model_path einmalig nach cache_dir und liefert (Pfad, Klassennamen).
+
+    Schlüssel = Inhalt der Gewichte + Format + Bildgröße + int8; Klassennamen liegen als JSON daneben,
+    damit das Laden später ohne ultralytics/torch auskommt.
+    int8: ONNX statisch quantisiert (QDQ, kalibriert auf calibration_frames Frames des Videos calibration) –
+    dynamische Quantisierung erzeugt ConvInteger-Knoten, die auf der CPU kaum schneller sind als FP32.
+    OpenVINO kalibriert über den ultralytics-Export mit dem Datensatz int8_data.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    base = os.path.join(cache_dir, f"{model_key(model_path)}_{imgsz}{backend_variant(fmt, int8)}")
+    target = base + (".onnx" if fmt == "onnx" else "_openvino")
+    meta_path = base + ".json"
+
+    if os.path.exists(target) and os.path.exists(meta_path):
+        with open(meta_path, "r") as f:
+            return target, {int(k): v for k, v in json.load(f)["names"].items()}
+
+    if fmt == "onnx" and int8 and calibration is None:
+        raise ValueError("int8-ONNX braucht ein Kalibrier-Video (calibration)")
+
+    from ultralytics import YOLO
+    model = YOLO(model_path)
+    # ultralytics legt Exporte neben die Gewichte – nur ins Cache-Verzeichnis übernehmen, nichts liegen lassen
+    side_onnx = os.path.splitext(model_path)[0] + ".onnx"
+    side_onnx_existed = os.path.exists(side_onnx)
+    print(f"ℹ️ Exportiere {model_path} nach {fmt}{' (int8)' if int8 else ''} ...")
+    if fmt == "onnx":
+        exported = model.export(format="onnx", imgsz=imgsz, dynamic=False, simplify=False)
+        if int8:
+            import onnxruntime as ort
+            from onnxruntime.quantization import QuantFormat, QuantType, quantize_static
+
+            frames = read_frames(calibration, calibration_frames, step=15)
+            if not frames:
+                raise IOError(f"Keine Kalibrier-Frames aus {calibration} gelesen")
+            input_name = ort.InferenceSession(exported, providers=["CPUExecutionProvider"]).get_inputs()[0].name
+            quantize_static(
+                exported, target, calibration_reader(frames, imgsz, input_name),
+                quant_format=QuantFormat.QDQ, activation_type=QuantType.QUInt8, weight_type=QuantType.QInt8,
+                per_channel=True,
+            )
+        else:
+            shutil.copyfile(exported, target)
+        if not side_onnx_existed and os.path.exists(exported):
+            os.remove(exported)
+    else:
+        kwargs = {"int8": True, "data": int8_data} if int8 else {}
+        exported = model.export(format="openvino", imgsz=imgsz, **kwargs)
+        if os.path.exists(target):
+            shutil.rmtree(target)
+        shutil.move(exported, target)
+        if not side_onnx_existed and os.path.exists(side_onnx):
+            os.remove(side_onnx)  # Zwischenstufe mancher ultralytics-Versionen
+
+    with open(meta_path, "w") as f:
+        json.dump({"names": {str(k): v for k, v in model.names.items()}, "imgsz": imgsz}, f)
+    return target, dict(model.names)
+
+
+# --- Backends: predict(frames, conf) -> [roh pro Frame], names {id: label}, variant ---
+
+class TorchBackend:
+    """ultralytics.YOLO.predict wie bisher (auch für eingeschleuste Modelle, z.B. Stubs)."""
+
+    def __init__(self, model_path: str, threads: int | None = None, model=None):
+        if model is None:
+            from ultralytics import YOLO  # erst bei Bedarf, der Import lädt torch
+            model = YOLO(model_path)
+            if threads:
+                import torch
+                torch.set_num_threads(threads)
+        self.model = model
+        self.names = model.names
+        self.variant = backend_variant("torch")
+
+    def predict(self, frames, conf: float):
+        results = self.model.predict(list(frames), conf=conf, verbose=False)
+        return [self._raw_from_result(r) for r in results]
+
+    @staticmethod
+    def _raw_from_result(result) -> dict:
+        boxes = result.boxes
+        return {
+            "xyxy": boxes.xyxy.cpu().numpy().astype(np.float32),
+            "conf": boxes.conf.cpu().numpy().astype(np.float32),
+            "cls": boxes.cls.cpu().numpy().astype(np.int32),
+        }
+
+
+class ExportedBackend:
+    """Basis für exportierte Modelle: Letterbox → _infer(blob) → NMS, Frame für Frame."""
+
+    name = None
+
+    def __init__(self, model_path: str, cache_dir: str, threads: int | None = None, int8: bool = False,
+                 imgsz: int = 640, int8_data: str = "coco128.yaml", calibration: str | None = None):
+        self.imgsz = imgsz
+        self.threads = threads
+        self.path, self.names = export_model(model_path, EXPORT_FORMATS[self.name], cache_dir, imgsz, int8,
+                                             int8_data, calibration)
+        self.variant = backend_variant(self.name, int8)
+        self._load()
+
+    def predict(self, frames, conf: float):
+        raws = []
+        for frame in frames:
+            image, ratio, pad = letterbox(frame, self.imgsz)
+            output = self._infer(to_blob(image))
+            raws.append(postprocess(output, ratio, pad, frame.shape, conf))
+        return raws
+
+    def _load(self):
+        raise NotImplementedError
+
+    def _infer(self, blob: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+
+class OnnxBackend(ExportedBackend):
+    name = "onnx"
+
+    def _load(self):
+        import onnxruntime as ort
+        options = ort.SessionOptions()
+        if self.threads:
+            options.intra_op_num_threads = self.threads
+        self.session = ort.InferenceSession(self.path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def _infer(self, blob):
+        return self.session.run(None, {self.input_name: blob})[0]
+
+
+class OpenVinoBackend(ExportedBackend):
+    name = "openvino"
+
+    def _load(self):
+        import openvino as ov
+        core = ov.Core()
+        xml = next(os.path.join(self.path, f) for f in os.listdir(self.path) if f.endswith(".xml"))
+        config = {"INFERENCE_NUM_THREADS": self.threads} if self.threads else {}
+        self.compiled = core.compile_model(xml, "CPU", config)
+        self.output = self.compiled.output(0)
+
+    def _infer(self, blob):
+        return self.compiled([blob])[self.output]
+
+
+def create_backend(name: str, model_path: str, cache_dir: str, threads: int | None = None, int8: bool = False,
+                   model=None, int8_data: str = "coco128.yaml", calibration: str | None = None):
+    if name == "torch":
+        return TorchBackend(model_path, threads, model)
+    if name == "onnx":
+        return OnnxBackend(model_path, cache_dir, threads, int8, int8_data=int8_data, calibration=calibration)
+    if name == "openvino":
+        return OpenVinoBackend(model_path, cache_dir, threads, int8, int8_data=int8_data, calibration=calibration)
+    raise ValueError(f"Unbekanntes Backend: {name} (erlaubt: {', '.join(BACKENDS)})")
+
+
+# --- Parity-Check ---
+
+def box_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Paarweise IoU zweier xyxy-Arrays → (len(a), len(b))."""
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = (x2 - x1).clip(0) * (y2 - y1).clip(0)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-9)
+
+
+def match_detections(reference: dict, candidate: dict, iou_thresh: float = 0.5):
+    """Greedy-Zuordnung gleicher Klassen nach IoU → (Treffer, IoUs der Treffer, Konfidenz-Differenzen)."""
+    if len(reference["conf"]) == 0 or len(candidate["conf"]) == 0:
+        return 0, [], []
+    iou = box_iou(reference["xyxy"], candidate["xyxy"])
+    iou[reference["cls"][:, None] != candidate["cls"][None, :]] = 0
+    matches, ious, conf_diffs = 0, [], []
+    for i in np.argsort(-reference["conf"]):
+        j = int(iou[i].argmax())
+        if iou[i, j] < iou_thresh:
+            continue
+        matches += 1
+        ious.append(float(iou[i, j]))
+        conf_diffs.append(abs(float(reference["conf"][i] - candidate["conf"][j])))
+        iou[:, j] = 0  # Kandidat ist vergeben
+    return matches, ious, conf_diffs
+
+
+def parity_check(reference, candidate, frames, conf: float = 0.25, iou_thresh: float = 0.5) -> dict:
+    """Vergleicht zwei Backends auf denselben Frames (Referenz = normalerweise torch): Treffer und Latenz."""
+    ref_total = cand_total = matched = 0
+    ious, conf_diffs = [], []
+    ref_times, cand_times = [], []
+    reference.predict(frames[:1], conf)  # Warm-up, sonst misst der erste Frame die Initialisierung
+    candidate.predict(frames[:1], conf)
+    for frame in frames:
+        start = time.perf_counter()
+        ref = reference.predict([frame], conf)[0]
+        ref_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        cand = candidate.predict([frame], conf)[0]
+        cand_times.append(time.perf_counter() - start)
+        m, frame_ious, frame_diffs = match_detections(ref, cand, iou_thresh)
+        ref_total += len(ref["conf"])
+        cand_total += len(cand["conf"])
+        matched += m
+        ious += frame_ious
+        conf_diffs += frame_diffs
+    return {
+        "frames": len(frames),
+        "reference_boxes": ref_total,
+        "candidate_boxes": cand_total,
+        "recall": matched / ref_total if ref_total else 1.0,
+        "precision": matched / cand_total if cand_total else 1.0,
+        "mean_iou": float(np.mean(ious)) if ious else 0.0,
+        "mean_conf_diff": float(np.mean(conf_diffs)) if conf_diffs else 0.0,
+        "reference_ms": float(np.median(ref_times)) * 1000,
+        "candidate_ms": float(np.median(cand_times)) * 1000,
+        "speedup": float(np.median(ref_times) / np.median(cand_times)),
+    }
+
+
+def read_frames(video_path: str, count: int, step: int = 10):
+    """count Frames (RGB) im Abstand step – Eingabe für den Parity-Check."""
+    cap = cv2.VideoCapture(video_path)
+    frames = []
+    index = 0
+    while len(frames) < count:
+        success, frame = cap.read()
+        if not success:
+            break
+        if index % step == 0:
+            frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        index += 1
+    cap.release()
+    return frames
+
+
+def main():
+    from config import DETECTOR_EXPORT_FOLDER
+
+    parser = argparse.ArgumentParser(description="Exportiertes Backend gegen PyTorch prüfen.")
+    parser.add_argument("--video", required=True, help="Video für die Testframes")
+    parser.add_argument("--model", default="yolov8n.pt", help="YOLO-Gewichte")
+    parser.add_argument("--backend", default="onnx", choices=BACKENDS[1:], help="Zu prüfendes Backend")
+    parser.add_argument("--int8", action="store_true", help="int8-quantisiertes Modell prüfen")
+    parser.add_argument("--threads", type=int, default=None, help="CPU-Threads")
+    parser.add_argument("--frames", type=int, default=30, help="Anzahl Testframes")
+    parser.add_argument("--conf", type=float, default=0.25, help="Konfidenz-Schwelle für den Vergleich")
+    parser.add_argument("--calibration", default=None, help="Kalibrier-Video für int8-ONNX (Standard: --video)")
+    parser.add_argument("--min-recall", type=float, default=0.9, help="Mindest-Recall gegenüber PyTorch")
+    args = parser.parse_args()
+
+    frames = read_frames(args.video, args.frames)
+    if not frames:
+        print(f"❌ Keine Frames aus {args.video} gelesen.")
+        sys.exit(1)
+
+    reference = create_backend("torch", args.model, DETECTOR_EXPORT_FOLDER, args.threads)
+    candidate = create_backend(args.backend, args.model, DETECTOR_EXPORT_FOLDER, args.threads, args.int8,
+                               calibration=args.calibration or args.video)
+    report = parity_check(reference, candidate, frames, args.conf)
+
+    for key, value in report.items():
+        print(f"   {key:<16} {value:.3f}" if isinstance(value, float) else f"   {key:<16} {value}")
+    if report["recall"] < args.min_recall:
+        print(f"❌ Recall {report['recall']:.1%} unter {args.min_recall:.0%}")
+        sys.exit(1)
+    print(f"✅ {args.backend}{' int8' if args.int8 else ''} stimmt mit PyTorch überein "
+          f"({report['candidate_ms']:.1f} ms statt {report['reference_ms']:.1f} ms pro Frame, {report['speedup']:.2f}x)")
+    if report["speedup"] < 1.0:
+        print("⚠️ Exportiertes Backend ist langsamer als PyTorch – Threads/int8-Einstellung prüfen")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# detection/detection_cache.py - Persistenter Cache für rohe Detektor-Ausgaben
+
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+from video.fingerprint import file_fingerprint
+
+
+def model_key(model_path: str) -> str:
+    # Lokale Gewichte über den Inhalt, sonst (z.B. Auto-Download "yolov8n.pt") über den Namen
+    if os.path.exists(model_path):
+        return file_fingerprint(model_path)
+    return os.path.splitext(os.path.basename(model_path))[0]
+
+
+class DetectionCache:
+    """Speichert Rohdetektionen (xyxy, conf, cls) pro Frame in einer SQLite-Datei.
+
+    Eine Datei pro Kombination aus Video-Inhalt, Modellgewichten, Backend-Variante und Roh-Schwelle.
+    conf_thresh und Klassenfilter werden erst beim Auslesen angewendet (YOLOv8Detector.filter_raw).
+    Mit DuplicateIndex teilen sich alle Frames eines Duplikat-Laufs den Eintrag ihres ersten Frames.
+    Solche Einträge können von einem beliebigen Frame des Laufs stammen und liegen daher in einer
+    eigenen Datei pro Duplikat-Index – ohne Index oder mit anderer Schwelle werden sie nie gelesen.
+    Ausschnitt-Ergebnisse des RoiDetector liegen getrennt in roi_detections (nur fürs Nachspielen).
+    """
+
+    def __init__(self, cache_dir: str, video_path: str, model_path: str, raw_conf: float = 0.01, duplicates=None,
+                 variant: str = ""):
+        # variant: z.B. "-onnx-int8" (backend_variant), leer für PyTorch – quantisierte Modelle liefern andere Boxen
+        os.makedirs(cache_dir, exist_ok=True)
+        runs = f"_dup{duplicates.fingerprint}" if duplicates is not None else ""
+        name = f"{file_fingerprint(video_path)}_{model_key(model_path)}{variant}_{raw_conf:g}{runs}.sqlite"
+        self.path = os.path.join(cache_dir, name)
+
+        self.lock = threading.Lock()  # Zugriff auch aus Worker-Threads
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        for table in ("detections", "roi_detections"):
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "frame INTEGER PRIMARY KEY, count INTEGER, xyxy BLOB, conf BLOB, cls BLOB)"
+            )
+        self.conn.commit()
+        self.duplicates = duplicates
+
+    def key_for(self, frame_index: int) -> int:
+        return self.duplicates.representative(frame_index) if self.duplicates is not None else frame_index
+
+    def get(self, frame_index: int, table: str = "detections"):
+        with self.lock:
+            row = self.conn.execute(
+                f"SELECT count, xyxy, conf, cls FROM {table} WHERE frame = ?", (frame_index,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        count, xyxy, conf, cls = row
+        return {
+            "xyxy": np.frombuffer(xyxy, dtype=np.float32).reshape(count, 4),
+            "conf": np.frombuffer(conf, dtype=np.float32),
+            "cls": np.frombuffer(cls, dtype=np.int32),
+        }
+
+    def put(self, frame_index: int, raw: dict):
+        self.put_many({frame_index: raw})
+
+    def put_many(self, raws: dict, table: str = "detections"):
+        rows = [
+            (
+                frame_index,
+                len(raw["conf"]),
+                np.ascontiguousarray(raw["xyxy"], dtype=np.float32).tobytes(),
+                np.ascontiguousarray(raw["conf"], dtype=np.float32).tobytes(),
+                np.ascontiguousarray(raw["cls"], dtype=np.int32).tobytes(),
+            )
+            for frame_index, raw in raws.items()
+        ]
+        with self.lock:
+            self.conn.executemany(f"INSERT OR REPLACE INTO {table} VALUES (?, ?, ?, ?, ?)", rows)
+            self.conn.commit()
+
+    def get_roi(self, frame_index: int):
+        """Ausschnitt-Ergebnis (RoiDetector) genau dieses Frames – zum Nachspielen des Trackers."""
+        return self.get(frame_index, "roi_detections")
+
+    def put_roi(self, frame_index: int, raw: dict):
+        # Eigene Tabelle, Schlüssel ist der Frame selbst: Ausschnitte hängen vom Trackerstand ab
+        self.put_many({frame_index: raw}, "roi_detections")
+
+    def detect(self, detector, frame_index: int, frame: np.ndarray):
+        """Rohdetektionen aus dem Cache, sonst über detector.detect_raw() berechnen und ablegen."""
+        key = self.key_for(frame_index)
+        raw = self.get(key)
+        if raw is None:
+            raw = detector.detect_raw(frame)
+            self.put(key, raw)
+        return raw
+
+    def detect_batch(self, detector, frame_indices, frames):
+        keys = [self.key_for(idx) for idx in frame_indices]
+        raws = {key: self.get(key) for key in set(keys)}
+        # Pro fehlendem Schlüssel nur einen Frame rechnen (Duplikate im selben Batch teilen sich das Ergebnis)
+        missing = {}
+        for key, frame in zip(keys, frames):
+            if raws[key] is None and key not in missing:
+                missing[key] = frame
+        if missing:
+            computed = detector.detect_batch_raw(list(missing.values()))
+            new_raws = dict(zip(missing, computed))
+            self.put_many(new_raws)
+            raws.update(new_raws)
+        return [raws[key] for key in keys]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
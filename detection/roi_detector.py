@@ -0,0 +1,176 @@
+# detection/roi_detector.py - YOLO nur auf Ausschnitten um vorhergesagte Tracks + Einfahrtszonen (feste Kamera)
+
+import numpy as np
+
+from detection.backends import nms
+
+
+class RoiDetector:
+    """Ersetzt den Vollbild-Durchlauf durch gepolsterte Ausschnitte, solange der Tracker bestätigte Tracks hat.
+
+    - Ausschnitte: vorhergesagte Track-Boxen (bestätigt + vorläufig, damit neue Objekte bestätigt werden
+      können) um padding * Boxgröße erweitert, dazu die festen Einfahrtszonen; nur Ausschnitte, die
+      weitgehend ineinander liegen, werden vereinigt – teilweise Überlappungen bleiben bestehen
+    - Vollbild: ohne bestätigte Tracks, alle refresh_interval Frames, nach Sprüngen und wenn die
+      Ausschnitte zusammen mehr als max_area des Bildes abdecken
+    - Ergebnisse werden in Frame-Koordinaten verschoben und über alle Ausschnitte hinweg bereinigt:
+      klassenweise NMS, dazu fallen Teilboxen weg (ein an der Ausschnittkante abgeschnittenes Objekt),
+      die fast vollständig in einer besser bewerteten Box derselben Klasse liegen
+
+    Ausschnitt-Ergebnisse liegen im Detection-Cache in einer eigenen Tabelle (get_roi/put_roi), damit
+    das Nachspielen nach einem Sprung dem Tracker dieselben Eingaben liefert wie der Vorwärtsdurchlauf.
+    """
+
+    def __init__(self, detector, refresh_interval: int = 30, padding: float = 0.5, min_size: int = 128,
+                 max_area: float = 0.5, entry_zones=(), iou_thresh: float = 0.7, contain_thresh: float = 0.8):
+        self.detector = detector
+        self.refresh_interval = max(refresh_interval, 1)
+        self.padding = padding
+        self.min_size = min_size
+        self.max_area = max_area
+        self.entry_zones = list(entry_zones)  # (x1, y1, x2, y2) relativ zur Bildgröße (0..1)
+        self.iou_thresh = iou_thresh
+        self.contain_thresh = contain_thresh  # Anteil einer Box, der in einer anderen liegen muss → Teilbox
+        self.last_full = None  # Frame-Index des letzten Vollbild-Ergebnisses
+        self.full_passes = 0
+        self.roi_passes = 0
+        self.roi_pixels = 0.0  # Summe der abgedeckten Bildanteile in ROI-Durchläufen
+
+    def regions(self, frame_index: int, frame_shape, predicted, confirmed: int):
+        """Ausschnitte (x1, y1, x2, y2) als int-Array oder None für einen Vollbild-Durchlauf."""
+        if (
+            predicted is None
+            or confirmed == 0
+            or self.last_full is None
+            or frame_index <= self.last_full
+            or frame_index - self.last_full >= self.refresh_interval
+        ):
+            return None
+
+        height, width = frame_shape[:2]
+        boxes = np.asarray(predicted, dtype=np.float32).reshape(-1, 4)
+        size = np.maximum(boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1])
+        pad = np.maximum(size * self.padding, (self.min_size - size) / 2).clip(0)[:, None]
+        rects = np.hstack([boxes[:, :2] - pad, boxes[:, 2:] + pad])
+
+        if self.entry_zones:
+            zones = np.asarray(self.entry_zones, dtype=np.float32) * np.array([width, height, width, height])
+            rects = np.vstack([rects, zones])
+
+        rects[:, [0, 2]] = rects[:, [0, 2]].clip(0, width)
+        rects[:, [1, 3]] = rects[:, [1, 3]].clip(0, height)
+        rects = self.merge(rects.round().astype(np.int32), self.contain_thresh)
+        rects = rects[(rects[:, 2] > rects[:, 0]) & (rects[:, 3] > rects[:, 1])]
+
+        area = float(((rects[:, 2] - rects[:, 0]) * (rects[:, 3] - rects[:, 1])).sum()) / (width * height)
+        if len(rects) == 0 or area > self.max_area:
+            return None  # Vollbild ist dann kaum teurer und sieht alles
+        return rects
+
+    @staticmethod
+    def merge(rects: np.ndarray, contain: float = 0.8) -> np.ndarray:
+        """Vereinigt Rechtecke, von denen eines zu mindestens contain im anderen liegt.
+
+        Nur teilweise überlappende bleiben getrennt – die Vereinigung wäre oft deutlich größer als beide.
+        """
+        def area(r):
+            return max(r[2] - r[0], 0) * max(r[3] - r[1], 0)
+
+        rects = [list(r) for r in rects]
+        merged = True
+        while merged:
+            merged = False
+            for i in range(len(rects)):
+                for j in range(i + 1, len(rects)):
+                    a, b = rects[i], rects[j]
+                    inter = area([max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3])])
+                    if inter > 0 and inter >= contain * min(area(a), area(b)):
+                        rects[i] = [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+                        del rects[j]
+                        merged = True
+                        break
+                if merged:
+                    break
+        return np.asarray(rects, dtype=np.int32).reshape(-1, 4)
+
+    def detect_regions(self, frame: np.ndarray, rects: np.ndarray) -> dict:
+        """Alle Ausschnitte in einem Batch rechnen, in Frame-Koordinaten verschieben und per NMS bereinigen."""
+        crops = [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in rects.tolist()]
+        raws = self.detector.detect_batch_raw(crops)
+
+        xyxy = np.concatenate([raw["xyxy"] + np.array([x1, y1, x1, y1], dtype=np.float32)
+                               for raw, (x1, y1, _, _) in zip(raws, rects.tolist())])
+        conf = np.concatenate([raw["conf"] for raw in raws])
+        cls = np.concatenate([raw["cls"] for raw in raws])
+        if len(rects) > 1 and len(conf):
+            keep = self.dedupe(xyxy, conf, cls)
+            xyxy, conf, cls = xyxy[keep], conf[keep], cls[keep]
+        return {"xyxy": xyxy.astype(np.float32), "conf": conf.astype(np.float32), "cls": cls.astype(np.int32)}
+
+    def dedupe(self, xyxy: np.ndarray, conf: np.ndarray, cls: np.ndarray) -> np.ndarray:
+        """Indizes der Boxen, die nach NMS und Teilbox-Unterdrückung übrig bleiben (nach Score sortiert)."""
+        # Dasselbe Objekt in zwei überlappenden Ausschnitten → fast gleiche Boxen, klassenweise NMS
+        offsets = cls[:, None].astype(np.float32) * 7680.0
+        keep = nms(xyxy + offsets, conf, self.iou_thresh)
+
+        # An einer Ausschnittkante abgeschnittenes Objekt → Teilbox mit kleiner IoU, aber fast ganz
+        # in der vollständigen Box aus dem Nachbarausschnitt
+        boxes = xyxy[keep]
+        x1 = np.maximum(boxes[:, None, 0], boxes[None, :, 0])
+        y1 = np.maximum(boxes[:, None, 1], boxes[None, :, 1])
+        x2 = np.minimum(boxes[:, None, 2], boxes[None, :, 2])
+        y2 = np.minimum(boxes[:, None, 3], boxes[None, :, 3])
+        inter = (x2 - x1).clip(0) * (y2 - y1).clip(0)
+        areas = ((boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])).clip(1e-9)
+        inside = inter / areas[:, None]  # inside[i, j]: Anteil von Box i, der in Box j liegt
+        same_class = cls[keep][:, None] == cls[keep][None, :]
+        # keep ist absteigend nach Score → j < i heißt besser bewertet
+        covered = np.tril((inside >= self.contain_thresh) & same_class, k=-1).any(axis=1)
+        return keep[~covered]
+
+    def detect_raw(self, frame_index: int, frame: np.ndarray, predicted, confirmed: int, cache=None) -> dict:
+        """Rohdetektionen für frame_index; predicted/confirmed aus DeepSortTracker.predicted_boxes().
+
+        Mit cache: vorhandene Vollbild-Rohdaten haben Vorrang, Vollbild-Durchläufe werden dort abgelegt,
+        Ausschnitt-Ergebnisse in der ROI-Tabelle (für replay_raw).
+        """
+        if cache is not None:
+            raw = cache.get(cache.key_for(frame_index))
+            if raw is not None:
+                self.last_full = frame_index
+                return raw
+
+        rects = self.regions(frame_index, frame.shape, predicted, confirmed)
+        if rects is None:
+            self.last_full = frame_index
+            self.full_passes += 1
+            return cache.detect(self.detector, frame_index, frame) if cache is not None else self.detector.detect_raw(frame)
+
+        self.roi_passes += 1
+        height, width = frame.shape[:2]
+        self.roi_pixels += float(((rects[:, 2] - rects[:, 0]) * (rects[:, 3] - rects[:, 1])).sum()) / (width * height)
+        raw = self.detect_regions(frame, rects)
+        if cache is not None:
+            cache.put_roi(frame_index, raw)
+        return raw
+
+    def replay_raw(self, frame_index: int, frame: np.ndarray, cache) -> dict:
+        """Eingabe für das Tracker-Nachspielen: was der Vorwärtsdurchlauf für diesen Frame benutzt hat.
+
+        Verändert weder Refresh-Zustand noch Statistik; nie gesehene Frames bekommen ein Vollbild.
+        """
+        raw = cache.get(cache.key_for(frame_index))
+        if raw is None:
+            raw = cache.get_roi(frame_index)
+        if raw is None:
+            raw = cache.detect(self.detector, frame_index, frame)
+        return raw
+
+    def stats(self) -> dict:
+        passes = self.full_passes + self.roi_passes
+        return {
+            "full_passes": self.full_passes,
+            "roi_passes": self.roi_passes,
+            "roi_fraction": self.roi_passes / passes if passes else 0.0,
+            "roi_area": self.roi_pixels / self.roi_passes if self.roi_passes else 0.0,
+        }
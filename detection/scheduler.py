@@ -0,0 +1,84 @@
+# detection/scheduler.py - Entscheidet pro Frame, ob YOLO laufen muss (Stride + Bewegungsschwelle)
+
+import cv2
+import numpy as np
+
+
+class DetectionScheduler:
+    """YOLO nur alle stride Frames oder wenn sich das Bild seit der letzten Detektion merklich verändert hat.
+
+    Bewegung = mittlere absolute Differenz zweier stark verkleinerter Graubilder (0..1). In den
+    übersprungenen Frames schreibt der Tracker die Boxen per Bewegungsmodell fort.
+    stride=1 → jeder Frame wird detektiert (bisheriges Verhalten).
+
+    Jede Entscheidung wird beim ersten Mal festgehalten und danach wiederverwendet, damit das
+    Nachspielen nach einem Sprung dem Tracker dieselben Eingaben liefert wie der Vorwärtsdurchlauf.
+    """
+
+    def __init__(self, stride: int = 5, motion_threshold: float = 0.02, thumb_width: int = 64):
+        self.stride = max(stride, 1)
+        self.motion_threshold = motion_threshold
+        self.thumb_width = thumb_width
+        self.last_detected = None  # Frame-Index der letzten Detektion
+        self.last_thumb = None
+        self.decisions = {}  # frame_index -> bool, einmal getroffen gilt sie für immer
+        self.frames = 0
+        self.inferred = 0
+
+    def thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        h, w = frame.shape[:2]
+        thumb_h = max(int(h * self.thumb_width / max(w, 1)), 1)
+        small = cv2.resize(frame, (self.thumb_width, thumb_h), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_RGB2GRAY).astype(np.float32) / 255.0
+
+    def motion_score(self, thumb: np.ndarray) -> float:
+        if self.last_thumb is None or self.last_thumb.shape != thumb.shape:
+            return 1.0
+        return float(np.mean(np.abs(thumb - self.last_thumb)))
+
+    def should_detect(self, frame_index: int, frame: np.ndarray, replay: bool = False) -> bool:
+        """Entscheidung für diesen Frame; bei True gilt er als neue Referenz für die Bewegung.
+
+        replay=True (Tracker-Nachspielen): bekannte Entscheidungen unverändert, neue nur nach Stride –
+        ohne Bewegungsreferenz und Statistik anzufassen.
+        """
+        decision = self.decisions.get(frame_index)
+        if decision is not None:
+            return decision
+
+        if self.stride == 1:
+            decision = True
+        elif replay:
+            decision = frame_index % self.stride == 0
+        else:
+            thumb = self.thumbnail(frame)
+            # Bewegung nur gegen eine Referenz kurz davor – nach Sprüngen entscheidet allein der Stride
+            recent = self.last_detected is not None and 0 < frame_index - self.last_detected < self.stride
+            decision = (
+                self.last_detected is None
+                or frame_index % self.stride == 0
+                or (recent and self.motion_score(thumb) > self.motion_threshold)
+            )
+            if decision:
+                self.last_detected = frame_index
+                self.last_thumb = thumb
+
+        self.decisions[frame_index] = decision
+        if not replay:
+            self.frames += 1
+            self.inferred += decision
+        return decision
+
+    @property
+    def inferred_fraction(self) -> float:
+        return self.inferred / self.frames if self.frames else 0.0
+
+    def stats(self) -> dict:
+        return {"frames": self.frames, "inferred": self.inferred, "inferred_fraction": self.inferred_fraction}
+
+    def reset(self):
+        self.last_detected = None
+        self.last_thumb = None
+        self.decisions.clear()
+        self.frames = 0
+        self.inferred = 0
@@ -1,28 +1,66 @@
 # detection/yolo8_wrapper.py
 
-from ultralytics import YOLO
 from typing import List, Tuple
 import numpy as np
 
+from config import DETECTOR_EXPORT_FOLDER
+from detection.backends import create_backend
+
 class YOLOv8Detector:
-    def __init__(self, model_path: str = "yolov8n.pt", conf_thresh: float = 0.5):
-        self.model = YOLO(model_path)
+    DEFAULT_RAW_CONF = 0.01
+
+    def __init__(self, model_path: str = "yolov8n.pt", conf_thresh: float = 0.5, batch_size: int = 8,
+                 classes=None, raw_conf: float = DEFAULT_RAW_CONF, model=None,
+                 backend: str = "torch", threads: int | None = None, int8: bool = False,
+                 export_dir: str = DETECTOR_EXPORT_FOLDER, calibration: str | None = None):
+        # model: bereits geladenes Modell mit predict() und names (z.B. Stub in den Benchmarks) → immer torch-Pfad
+        # backend: "torch", "onnx" oder "openvino"; exportierte Modelle landen einmalig in export_dir
+        # calibration: Video mit typischen Frames für den int8-ONNX-Export (nur beim ersten Export gebraucht)
+        self.backend = create_backend("torch" if model is not None else backend, model_path, export_dir,
+                                      threads, int8, model, calibration=calibration)
+        self.model_path = model_path
+        self.variant = self.backend.variant  # Teil des Detection-Cache-Schlüssels
         self.conf_thresh = conf_thresh
+        self.batch_size = batch_size
+        self.classes = classes    # None = alle Klassen, sonst Menge erlaubter Labels
+        self.raw_conf = raw_conf  # Schwelle für Rohdaten (Cache), gefiltert wird erst danach
+        # Klassennamen als Array → Mapping per Fancy-Indexing statt Dict-Lookup pro Box
+        names = self.backend.names
+        self.class_names = np.array([names[i] for i in range(len(names))], dtype=object)
 
     def detect(self, frame: np.ndarray) -> List[dict]:
-        results = self.model.predict(frame, verbose=False)
-        detections = []
-
-        for r in results:
-            for box in r.boxes:
-                conf = float(box.conf[0])
-                label = self.model.names[int(box.cls[0])]
-                if conf >= self.conf_thresh:
-                    x1, y1, x2, y2 = map(int, box.xyxy[0])
-                    detections.append({
-                        "label": label,
-                        "confidence": conf,
-                        "box": (x1, y1, x2, y2)
-                    })
-
-        return detections
\ No newline at end of file
+        return self.filter_raw(self.detect_raw(frame))
+
+    def detect_batch(self, frames: List[np.ndarray]) -> List[List[dict]]:
+        """Wie detect(), aber mit bis zu batch_size Frames pro Modellaufruf. Liefert eine Liste pro Frame."""
+        return [self.filter_raw(raw) for raw in self.detect_batch_raw(frames)]
+
+    def detect_raw(self, frame: np.ndarray) -> dict:
+        """Ungefilterte Modellausgabe (alle Klassen, conf >= raw_conf) als Arrays."""
+        return self.backend.predict([frame], self.raw_conf)[0]
+
+    def detect_batch_raw(self, frames: List[np.ndarray]) -> List[dict]:
+        all_raw = []
+
+        for start in range(0, len(frames), self.batch_size):
+            chunk = frames[start:start + self.batch_size]
+            all_raw.extend(self.backend.predict(chunk, self.raw_conf))
+
+        return all_raw
+
+    def filter_raw(self, raw: dict) -> List[dict]:
+        # Filtern und Konvertieren auf ganzen Arrays statt pro Box
+        keep = raw["conf"] >= self.conf_thresh
+        labels = self.class_names[raw["cls"]]
+        if self.classes is not None:
+            keep &= np.isin(labels, list(self.classes))
+        if not keep.any():
+            return []
+
+        conf = raw["conf"][keep]
+        xyxy = raw["xyxy"][keep].astype(int)
+
+        return [
+            {"label": label, "confidence": c, "box": tuple(box)}
+            for label, c, box in zip(labels[keep].tolist(), conf.tolist(), xyxy.tolist())
+        ]
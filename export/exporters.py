@@ -0,0 +1,258 @@
+# export/exporters.py - Streamende Exporter (CSV, YOLO-txt, COCO-JSON) mit inkrementellem Re-Export
+
+import csv
+import hashlib
+import io
+import json
+import os
+import shutil
+
+
+def frame_digest(annotations) -> str:
+    """Inhalts-Hash eines Frames – bestimmt, ob der Frame seit dem letzten Export neu geschrieben werden muss."""
+    digest = hashlib.sha1()
+    for ann in annotations:
+        digest.update(repr((ann.annotation_id, ann.label, tuple(ann.box), ann.source, ann.track_id)).encode())
+    return digest.hexdigest()
+
+
+class FrameExporter:
+    """Basisklasse: geht die Quelle Frame für Frame durch und schreibt nur geänderte Frames neu.
+
+    source muss iter_frames(frames=None) -> (frame, annotations) anbieten (AnnotationStore, AnnotationTable).
+    Pro Exporter liegt ein Manifest {frame: digest} im Ausgabeordner.
+    """
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.manifest_path = os.path.join(output_dir, f".{type(self).__name__}.manifest.json")
+
+    def export(self, source, frames=None) -> dict:
+        """frames: optional nur diese Frames exportieren (z.B. ausgedünnt). Liefert eine kleine Statistik."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        manifest = self._load_manifest()
+        old_digests = manifest.get("frames", {})
+        new_digests = {}
+        written = 0
+
+        for frame, annotations in source.iter_frames(frames):
+            annotations = list(annotations)  # nur ein Frame gleichzeitig im Speicher
+            if not annotations:
+                continue
+            key = str(frame)
+            digest = frame_digest(annotations)
+            new_digests[key] = digest
+            if old_digests.get(key) != digest or not self.frame_exists(frame):
+                self.write_frame(frame, annotations)
+                written += 1
+
+        removed = [int(key) for key in old_digests if key not in new_digests]
+        for frame in removed:
+            self.remove_frame(frame)
+
+        frame_list = sorted(int(key) for key in new_digests)
+        self.finalize(frame_list)
+
+        manifest["frames"] = new_digests
+        self._save_manifest(manifest)
+        return {"frames": len(frame_list), "written": written, "removed": len(removed)}
+
+    # --- von Unterklassen zu implementieren ---
+    def write_frame(self, frame: int, annotations):
+        raise NotImplementedError
+
+    def remove_frame(self, frame: int):
+        raise NotImplementedError
+
+    def frame_exists(self, frame: int) -> bool:
+        raise NotImplementedError
+
+    def finalize(self, frames):
+        pass
+
+    # --- Manifest ---
+    def _load_manifest(self) -> dict:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, "r") as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: dict):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+
+class FragmentExporter(FrameExporter):
+    """Für Einzeldatei-Formate: pro Frame ein Fragment, das Ergebnis wird per Streaming zusammengesetzt."""
+
+    extension = ".part"
+
+    def __init__(self, output_path: str):
+        super().__init__(os.path.dirname(output_path) or ".")
+        self.output_path = output_path
+        self.parts_dir = output_path + ".parts"
+        self.manifest_path = os.path.join(self.parts_dir, "manifest.json")
+
+    def export(self, source, frames=None) -> dict:
+        os.makedirs(self.parts_dir, exist_ok=True)
+        return super().export(source, frames)
+
+    def part_path(self, frame: int) -> str:
+        return os.path.join(self.parts_dir, f"frame_{frame:06d}{self.extension}")
+
+    def write_frame(self, frame: int, annotations):
+        with open(self.part_path(frame), "w", newline="") as f:
+            f.write(self.render_fragment(frame, annotations))
+
+    def remove_frame(self, frame: int):
+        if os.path.exists(self.part_path(frame)):
+            os.remove(self.part_path(frame))
+
+    def frame_exists(self, frame: int) -> bool:
+        return os.path.exists(self.part_path(frame))
+
+    def render_fragment(self, frame: int, annotations) -> str:
+        raise NotImplementedError
+
+
+class CsvExporter(FragmentExporter):
+    """Eine Zeile pro Annotation: video_id, frame, label, x1, y1, x2, y2, source, track_id, annotation_id."""
+
+    extension = ".csv"
+    HEADER = ["video_id", "frame", "label", "x1", "y1", "x2", "y2", "source", "track_id", "annotation_id"]
+
+    def render_fragment(self, frame, annotations) -> str:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for ann in annotations:
+            x1, y1, x2, y2 = ann.box
+            track_id = "" if ann.track_id is None else ann.track_id
+            writer.writerow([ann.video_id, frame, ann.label, x1, y1, x2, y2, ann.source, track_id, ann.annotation_id])
+        return buffer.getvalue()
+
+    def finalize(self, frames):
+        tmp_path = self.output_path + ".tmp"
+        with open(tmp_path, "w", newline="") as out:
+            csv.writer(out).writerow(self.HEADER)
+            for frame in frames:
+                with open(self.part_path(frame), "r", newline="") as part:
+                    shutil.copyfileobj(part, out)
+        os.replace(tmp_path, self.output_path)
+
+
+class CocoJsonExporter(FragmentExporter):
+    """COCO-Detection-JSON; Fragment = Zeile 1 image-Eintrag, Zeile 2 annotations (ohne Klammern)."""
+
+    extension = ".json"
+
+    def __init__(self, output_path: str, image_size, categories, file_pattern: str = "frame_{:06d}.jpg"):
+        super().__init__(output_path)
+        self.width, self.height = image_size
+        self.categories = list(categories)
+        self.file_pattern = file_pattern
+
+    def category_id(self, label: str) -> int:
+        # Unbekannte Labels hinten anhängen → bestehende IDs bleiben stabil
+        if label not in self.categories:
+            self.categories.append(label)
+        return self.categories.index(label) + 1
+
+    def render_fragment(self, frame, annotations) -> str:
+        image = {"id": frame, "file_name": self.file_pattern.format(frame), "width": self.width, "height": self.height}
+        entries = []
+        for ann in annotations:
+            x1, y1, x2, y2 = ann.box
+            w, h = x2 - x1, y2 - y1
+            entries.append(json.dumps({
+                "id": ann.annotation_id,
+                "image_id": frame,
+                "category_id": self.category_id(ann.label),
+                "bbox": [x1, y1, w, h],
+                "area": w * h,
+                "iscrowd": 0,
+            }))
+        return json.dumps(image) + "\n" + ", ".join(entries) + "\n"
+
+    def export(self, source, frames=None) -> dict:
+        manifest = self._load_manifest()
+        for label in manifest.get("categories", []):
+            self.category_id(label)
+        return super().export(source, frames)
+
+    def _save_manifest(self, manifest: dict):
+        manifest["categories"] = self.categories
+        super()._save_manifest(manifest)
+
+    def finalize(self, frames):
+        tmp_path = self.output_path + ".tmp"
+        with open(tmp_path, "w") as out:
+            out.write('{"images": [')
+            for i, frame in enumerate(frames):
+                with open(self.part_path(frame), "r") as part:
+                    out.write((", " if i else "") + part.readline().rstrip("\n"))
+
+            out.write('], "annotations": [')
+            first = True
+            for frame in frames:
+                with open(self.part_path(frame), "r") as part:
+                    part.readline()
+                    entries = part.readline().rstrip("\n")
+                if entries:
+                    out.write(("" if first else ", ") + entries)
+                    first = False
+
+            categories = [{"id": i + 1, "name": name} for i, name in enumerate(self.categories)]
+            out.write('], "categories": ' + json.dumps(categories) + "}")
+        os.replace(tmp_path, self.output_path)
+
+
+class YoloTxtExporter(FrameExporter):
+    """YOLO-Format: pro Frame eine .txt mit "klasse cx cy w h" (normiert), dazu classes.txt."""
+
+    def __init__(self, output_dir: str, image_size, class_names):
+        super().__init__(output_dir)
+        self.width, self.height = image_size
+        self.class_names = list(class_names)
+
+    def class_index(self, label: str) -> int:
+        if label not in self.class_names:
+            self.class_names.append(label)
+        return self.class_names.index(label)
+
+    def label_path(self, frame: int) -> str:
+        return os.path.join(self.output_dir, f"frame_{frame:06d}.txt")
+
+    def export(self, source, frames=None) -> dict:
+        manifest = self._load_manifest()
+        for label in manifest.get("classes", []):
+            self.class_index(label)
+        return super().export(source, frames)
+
+    def write_frame(self, frame, annotations):
+        lines = []
+        for ann in annotations:
+            x1, y1, x2, y2 = ann.box
+            cx = (x1 + x2) / 2 / self.width
+            cy = (y1 + y2) / 2 / self.height
+            w = (x2 - x1) / self.width
+            h = (y2 - y1) / self.height
+            lines.append(f"{self.class_index(ann.label)} {cx:.6f} {cy:.6f} {w:.6f} {h:.6f}")
+        with open(self.label_path(frame), "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def remove_frame(self, frame):
+        if os.path.exists(self.label_path(frame)):
+            os.remove(self.label_path(frame))
+
+    def frame_exists(self, frame) -> bool:
+        return os.path.exists(self.label_path(frame))
+
+    def finalize(self, frames):
+        with open(os.path.join(self.output_dir, "classes.txt"), "w") as f:
+            f.write("\n".join(self.class_names) + "\n")
+
+    def _save_manifest(self, manifest: dict):
+        manifest["classes"] = self.class_names
+        super()._save_manifest(manifest)
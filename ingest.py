@@ -0,0 +1,265 @@
+# ingest.py - Projektweiter Import: alle Videos finden, prüfen und parallel verarbeiten (Prozess-Pool)
+
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import cv2
+
+from config import (
+    INPUT_FOLDER, OUTPUT_FOLDER, VIDEO_INDEX_FOLDER, PROXY_FOLDER, PROXY_MAX_SIDE, DUPLICATE_FOLDER, DUPLICATE_THRESHOLD,
+    DETECTOR_BACKEND, DETECTOR_INT8, DETECTOR_THREADS, DETECTOR_EXPORT_FOLDER,
+)
+from detection.backends import BACKENDS, EXPORT_FORMATS, export_model
+from prelabel import find_videos, prelabel_video, project_path_for
+from video.video_index import VideoIndex
+from video.proxy_store import ProxyStore
+from video.duplicates import DuplicateIndex
+
+STEPS = ("probe", "proxy", "duplicates", "prelabel")
+STATE_FILE = "ingest_state.json"
+
+# Pro Worker-Prozess nur einmal geladen (siehe get_detector)
+_detector = None
+
+
+def init_worker(threads_per_worker: int):
+    # Sonst nutzt jeder Prozess alle Kerne und die Worker bremsen sich gegenseitig aus
+    os.environ["OMP_NUM_THREADS"] = str(threads_per_worker)
+    cv2.setNumThreads(threads_per_worker)
+    if "torch" in sys.modules:  # per fork bereits importiert (prelabel lädt ultralytics)
+        sys.modules["torch"].set_num_threads(threads_per_worker)
+
+
+def get_detector(options: dict):
+    global _detector
+    if _detector is None:
+        from detection.yolo8_wrapper import YOLOv8Detector
+        _detector = YOLOv8Detector(options["model"], conf_thresh=options["conf"], backend=options["backend"],
+                                   threads=options["threads"], int8=options["int8"])
+    return _detector
+
+
+def probe_video(video_path: str, options: dict) -> dict:
+    # Baut den Video-Index gleich mit auf, die Oberfläche findet ihn danach im Cache
+    index = VideoIndex.open(video_path, VIDEO_INDEX_FOLDER)
+    meta = index.to_dict()
+    meta["keyframes"] = len(index.keyframes)
+    return meta
+
+
+def prelabel_step(video_path: str, options: dict) -> dict:
+    output_path = project_path_for(video_path, options["output"])
+    # Falls vorhanden: Duplikate bekommen die Detektionen ihres Laufanfangs statt eigener Inferenz
+    index = VideoIndex.open(video_path, VIDEO_INDEX_FOLDER)
+    duplicates = DuplicateIndex.open(DUPLICATE_FOLDER, index, DUPLICATE_THRESHOLD)
+    frames = prelabel_video(video_path, output_path, get_detector(options), progress_every=0, duplicates=duplicates)
+    return {"frames": frames, "project": output_path}
+
+
+def proxy_step(video_path: str, options: dict) -> dict:
+    index = VideoIndex.open(video_path, VIDEO_INDEX_FOLDER)
+    proxy = ProxyStore.open(PROXY_FOLDER, index, PROXY_MAX_SIDE)
+    if proxy is None:
+        proxy = ProxyStore.build(video_path, PROXY_FOLDER, index, PROXY_MAX_SIDE)
+    if proxy is None:
+        raise IOError("Keine Frames für den Proxy dekodiert")
+    return {"frames": proxy.frame_count, "width": proxy.width, "height": proxy.height}
+
+
+def duplicates_step(video_path: str, options: dict) -> dict:
+    index = VideoIndex.open(video_path, VIDEO_INDEX_FOLDER)
+    proxy = ProxyStore.open(PROXY_FOLDER, index, PROXY_MAX_SIDE)  # spart das erneute Dekodieren
+    duplicates = DuplicateIndex.open(DUPLICATE_FOLDER, index, DUPLICATE_THRESHOLD, video_path, proxy)
+    return {"frames": duplicates.frame_count, "distinct": duplicates.distinct_count}
+
+
+STEP_FUNCTIONS = {
+    "probe": probe_video,
+    "proxy": proxy_step,
+    "duplicates": duplicates_step,
+    "prelabel": prelabel_step,
+}
+
+
+def run_video_steps(video_path: str, steps, options: dict) -> dict:
+    """Läuft im Worker-Prozess. Fehler bleiben auf dieses Video beschränkt."""
+    results = {}
+    for step in steps:
+        start = time.perf_counter()
+        try:
+            value = STEP_FUNCTIONS[step](video_path, options)
+            results[step] = {"status": "done", "seconds": round(time.perf_counter() - start, 2), "result": value}
+        except Exception as e:
+            results[step] = {
+                "status": "failed",
+                "error": f"{type(e).__name__}: {e}",
+                "traceback": traceback.format_exc(limit=5),
+            }
+            break  # Folgeschritte bauen auf dem fehlgeschlagenen Schritt auf
+    return results
+
+
+class IngestState:
+    """Fortschritt pro Video in <output>/ingest_state.json → Neustart macht dort weiter, wo abgebrochen wurde."""
+
+    def __init__(self, output_folder: str):
+        self.path = os.path.join(output_folder, STATE_FILE)
+        self.videos = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                self.videos = json.load(f)
+
+    def entry(self, video_path: str) -> dict:
+        return self.videos.setdefault(video_path, {"steps": {}, "attempts": 0})
+
+    def pending_steps(self, video_path: str, steps, retries: int):
+        entry = self.entry(video_path)
+        size = os.path.getsize(video_path)
+        if entry.get("size") != size:
+            # Datei hat sich geändert → alles neu
+            entry.update({"size": size, "steps": {}, "attempts": 0})
+        if entry["attempts"] > retries:
+            return []
+        return [step for step in steps if entry["steps"].get(step, {}).get("status") != "done"]
+
+    def record(self, video_path: str, results: dict):
+        entry = self.entry(video_path)
+        entry["steps"].update(results)
+        if any(r["status"] == "failed" for r in results.values()):
+            entry["attempts"] += 1
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.videos, f, indent=4)
+        os.replace(tmp_path, self.path)
+
+
+def run_pool(jobs: dict, workers: int, threads_per_worker: int, options: dict, on_result):
+    """Verarbeitet jobs in einem Prozess-Pool → (Videos ohne Ergebnis wegen Pool-Absturz, abgebrochen?).
+
+    Ohne Fehlversuch: bei einem Absturz ist unklar, welches der offenen Videos ihn ausgelöst hat.
+    """
+    unfinished = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(threads_per_worker,)) as pool:
+        futures = {pool.submit(run_video_steps, video, pending, options): video for video, pending in jobs.items()}
+        for future in as_completed(futures):
+            video = futures[future]
+            try:
+                results = future.result()
+            except BrokenProcessPool:
+                # Worker ist hart abgestürzt (z.B. Segfault im Decoder)
+                unfinished[video] = jobs[video]
+                continue
+            if not on_result(video, results):
+                pool.shutdown(cancel_futures=True)
+                return unfinished, True
+    return unfinished, False
+
+
+def ingest(input_folder, output_folder, steps, workers, retries, fail_fast, options):
+    videos = find_videos(input_folder)
+    if not videos:
+        print(f"ℹ️ Keine Videos in {input_folder} gefunden.")
+        return
+
+    state = IngestState(output_folder)
+    jobs = {video: state.pending_steps(video, steps, retries) for video in videos}
+    jobs = {video: pending for video, pending in jobs.items() if pending}
+    skipped = len(videos) - len(jobs)
+    print(f"▶️ {len(videos)} Videos gefunden, {skipped} bereits fertig (oder zu oft fehlgeschlagen), {len(jobs)} zu verarbeiten")
+    if not jobs:
+        return
+
+    threads_per_worker = max((os.cpu_count() or 1) // workers, 1)
+    total = len(jobs)
+    counts = {"done": 0, "failed": 0}
+
+    def on_result(video, results) -> bool:
+        """Ergebnis eines Videos festhalten; False = abbrechen (fail_fast)."""
+        state.record(video, results)
+        state.save()
+        ok = all(r["status"] == "done" for r in results.values())
+        counts["done" if ok else "failed"] += 1
+        summary = " ".join(f"{step} {'✓' if r['status'] == 'done' else '✗'}" for step, r in results.items())
+        print(f"   [{counts['done'] + counts['failed']}/{total}] {os.path.basename(video)}: {summary}")
+        if not ok:
+            error = next(r["error"] for r in results.values() if r["status"] == "failed")
+            print(f"   ❌ {error}")
+        return ok or not fail_fast
+
+    def charge_crash(video, pending):
+        # Nur das Video, das nachweislich den Worker reißt, bekommt einen Fehlversuch
+        state.record(video, {pending[0]: {"status": "failed", "error": "Worker-Prozess abgestürzt"}})
+        retry = state.pending_steps(video, steps, retries)
+        if retry:
+            jobs[video] = retry
+        else:
+            counts["failed"] += 1
+            print(f"   ❌ {os.path.basename(video)}: Worker-Prozess abgestürzt")
+
+    while jobs:
+        suspects, stop = run_pool(jobs, workers, threads_per_worker, options, on_result)
+        if stop:
+            state.save()
+            return
+        jobs = {}
+        if len(suspects) == 1:
+            charge_crash(*next(iter(suspects.items())))
+        elif suspects:
+            # Ein Absturz reißt alle offenen Futures mit → Verdächtige einzeln in einem 1-Worker-Pool nachrechnen
+            print(f"ℹ️ Worker-Prozess abgestürzt, prüfe {len(suspects)} betroffene Videos einzeln")
+            for video, pending in suspects.items():
+                crashed, stop = run_pool({video: pending}, 1, threads_per_worker, options, on_result)
+                if stop:
+                    state.save()
+                    return
+                if crashed:
+                    charge_crash(video, pending)
+        state.save()
+
+    print(f"✅ Ingest fertig: {counts['done']} erfolgreich, {counts['failed']} fehlgeschlagen (Details in {state.path})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alle Videos im Input-Ordner parallel importieren.")
+    parser.add_argument("--input", default=INPUT_FOLDER, help="Ordner mit den Videos")
+    parser.add_argument("--output", default=OUTPUT_FOLDER, help="Zielordner")
+    parser.add_argument("--steps", default=",".join(STEPS), help=f"Kommagetrennt, Auswahl aus {', '.join(STEPS)}")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Anzahl Worker-Prozesse")
+    parser.add_argument("--retries", type=int, default=1, help="Wiederholungen pro fehlgeschlagenem Video")
+    parser.add_argument("--fail-fast", action="store_true", help="Beim ersten Fehler abbrechen")
+    parser.add_argument("--model", default="yolov8n.pt", help="YOLO-Gewichte")
+    parser.add_argument("--conf", type=float, default=0.5, help="Konfidenz-Schwelle")
+    parser.add_argument("--backend", default=DETECTOR_BACKEND, choices=BACKENDS, help="Inferenz-Backend")
+    parser.add_argument("--int8", action="store_true", default=DETECTOR_INT8, help="int8-quantisiertes Modell (onnx/openvino)")
+    parser.add_argument("--threads", type=int, default=DETECTOR_THREADS, help="Inferenz-Threads pro Worker")
+    args = parser.parse_args()
+
+    steps = [step.strip() for step in args.steps.split(",") if step.strip()]
+    unknown = [step for step in steps if step not in STEP_FUNCTIONS]
+    if unknown:
+        parser.error(f"Unbekannte Schritte: {', '.join(unknown)}")
+
+    workers = max(args.workers, 1)
+    options = {
+        "output": args.output, "model": args.model, "conf": args.conf, "backend": args.backend, "int8": args.int8,
+        "threads": args.threads or max((os.cpu_count() or 1) // workers, 1),
+    }
+    videos = find_videos(args.input)
+    if "prelabel" in steps and args.backend in EXPORT_FORMATS and videos:
+        # Einmal im Hauptprozess exportieren, sonst exportieren alle Worker gleichzeitig in denselben Cache
+        export_model(args.model, EXPORT_FORMATS[args.backend], DETECTOR_EXPORT_FOLDER, int8=args.int8,
+                     calibration=videos[0])
+    ingest(args.input, args.output, steps, workers, args.retries, args.fail_fast, options)
+
+
+if __name__ == "__main__":
+    main()
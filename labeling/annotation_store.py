@@ -0,0 +1,143 @@
+# labeling/annotation_store.py - Annotationen indiziert nach Frame und Quelle
+
+from dataclasses import asdict
+from typing import Iterable, List
+
+from labeling.annotation import Annotation
+
+
+class AnnotationStore:
+    """Hält Annotationen als frame -> source -> Liste.
+
+    Lesen, Ersetzen und Löschen eines Frames kosten O(Boxen im Frame), nicht O(alle Annotationen).
+    """
+
+    def __init__(self):
+        self.by_frame = {}  # frame -> {source: [Annotation]}
+        self.by_id = {}     # annotation_id -> Annotation
+        self.by_track = {}  # (label, track_id) -> {annotation_id: Annotation}, nur mit track_id
+        self.next_id = 1
+        self.count = 0
+
+    def add_annotation(self, ann: Annotation):
+        if ann.annotation_id is None:
+            ann.annotation_id = self.next_id
+        elif ann.annotation_id in self.by_id:
+            # Gleiche ID = gleiche Annotation → alten Eintrag ersetzen, sonst laufen die Indizes auseinander
+            self.delete_annotation(ann.annotation_id)
+        self.next_id = max(self.next_id, ann.annotation_id + 1)
+
+        self.by_frame.setdefault(ann.frame, {}).setdefault(ann.source, []).append(ann)
+        self.by_id[ann.annotation_id] = ann
+        if ann.track_id is not None:
+            self.by_track.setdefault((ann.label, ann.track_id), {})[ann.annotation_id] = ann
+        self.count += 1
+        return ann
+
+    def get_by_frame(self, frame: int, source: str | None = None) -> List[Annotation]:
+        sources = self.by_frame.get(frame)
+        if not sources:
+            return []
+        if source is not None:
+            return list(sources.get(source, []))
+        return [ann for anns in sources.values() for ann in anns]
+
+    def get(self, annotation_id: int):
+        return self.by_id.get(annotation_id)
+
+    def get_by_track(self, label: str, track_id: int, source: str | None = None) -> List[Annotation]:
+        """Alle Annotationen eines Objekts (label + track_id), nach Frame sortiert."""
+        anns = self.by_track.get((label, track_id), {}).values()
+        return sorted((ann for ann in anns if source is None or ann.source == source), key=lambda ann: ann.frame)
+
+    def replace_frame(self, frame: int, source: str, annotations: Iterable[Annotation]):
+        """Ersetzt alle Annotationen einer Quelle in einem Frame (z.B. neue YOLO-Ergebnisse).
+
+        Neue Annotationen ohne ID übernehmen die ID ihres Vorgängers mit gleichem (label, track_id),
+        damit ein erneuter YOLO-Lauf unveränderte Frames nicht als geändert markiert (Export-Digests).
+        """
+        previous = {
+            (ann.label, ann.track_id): ann.annotation_id
+            for ann in self._pop_frame(frame, source)
+            if ann.track_id is not None
+        }
+        for ann in annotations:
+            if ann.annotation_id is None and ann.track_id is not None:
+                ann.annotation_id = previous.pop((ann.label, ann.track_id), None)
+            self.add_annotation(ann)
+
+    def remove_frame(self, frame: int, source: str | None = None) -> int:
+        return len(self._pop_frame(frame, source))
+
+    def _pop_frame(self, frame: int, source: str | None = None) -> List[Annotation]:
+        sources = self.by_frame.get(frame)
+        if not sources:
+            return []
+
+        keys = [source] if source is not None else list(sources)
+        removed = []
+        for key in keys:
+            for ann in sources.pop(key, []):
+                del self.by_id[ann.annotation_id]
+                self._untrack(ann)
+                removed.append(ann)
+
+        if not sources:
+            del self.by_frame[frame]
+        self.count -= len(removed)
+        return removed
+
+    def delete_annotation(self, annotation_id: int) -> bool:
+        ann = self.by_id.pop(annotation_id, None)
+        if ann is None:
+            return False
+
+        self._untrack(ann)
+        sources = self.by_frame[ann.frame]
+        sources[ann.source].remove(ann)
+        if not sources[ann.source]:
+            del sources[ann.source]
+        if not sources:
+            del self.by_frame[ann.frame]
+        self.count -= 1
+        return True
+
+    def frames(self) -> List[int]:
+        return sorted(self.by_frame)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        # Frame für Frame, damit Exporte streamen können
+        for frame in self.frames():
+            yield from self.get_by_frame(frame)
+
+    def iter_frames(self, frames=None):
+        """(frame, annotations) in Frame-Reihenfolge – Eingabe für die Exporter."""
+        for frame in (self.frames() if frames is None else sorted(frames)):
+            yield frame, self.get_by_frame(frame)
+
+    @property
+    def annotations(self) -> List[Annotation]:
+        """Flache Liste (nur noch für Kompatibilität, O(n))."""
+        return list(self)
+
+    def export_as_dicts(self) -> List[dict]:
+        return [asdict(ann) for ann in self]
+
+    def clear(self):
+        self.by_frame.clear()
+        self.by_id.clear()
+        self.by_track.clear()
+        self.count = 0
+
+    def _untrack(self, ann: Annotation):
+        if ann.track_id is None:
+            return
+        key = (ann.label, ann.track_id)
+        track = self.by_track.get(key)
+        if track is not None:
+            track.pop(ann.annotation_id, None)
+            if not track:
+                del self.by_track[key]
@@ -0,0 +1,277 @@
+# labeling/annotation_table.py - Spaltenbasierte Annotationstabelle (Struct of Arrays) für große Datenmengen
+
+import numpy as np
+
+from labeling.annotation import Annotation
+
+NO_TRACK = -1  # track_id-Platzhalter; Konfidenz ohne Wert ist NaN
+
+
+class AnnotationRow:
+    """Leichte Sicht auf eine Zeile der Tabelle mit denselben Feldern wie Annotation."""
+
+    __slots__ = ("table", "index")
+
+    def __init__(self, table, index: int):
+        self.table = table
+        self.index = index
+
+    @property
+    def video_id(self) -> int:
+        return int(self.table.video_id[self.index])
+
+    @property
+    def frame(self) -> int:
+        return int(self.table.frame[self.index])
+
+    @property
+    def label(self) -> str:
+        return self.table.labels[self.table.label_code[self.index]]
+
+    @property
+    def box(self):
+        return tuple(self.table.box[self.index].tolist())
+
+    @property
+    def source(self) -> str:
+        return self.table.sources[self.table.source_code[self.index]]
+
+    @property
+    def track_id(self):
+        value = int(self.table.track_id[self.index])
+        return None if value == NO_TRACK else value
+
+    @property
+    def annotation_id(self) -> int:
+        return int(self.table.annotation_id[self.index])
+
+    @property
+    def confidence(self):
+        value = float(self.table.confidence[self.index])
+        return None if np.isnan(value) else value
+
+    def to_annotation(self) -> Annotation:
+        return Annotation(self.video_id, self.frame, self.label, self.box, self.source, self.track_id, self.annotation_id)
+
+    def __repr__(self):
+        return f"AnnotationRow(frame={self.frame}, label={self.label!r}, box={self.box}, source={self.source!r})"
+
+
+class AnnotationTable:
+    """Annotationen als NumPy-Spalten statt einzelner Objekte.
+
+    Labels und Quellen werden als Codes gespeichert (labels[code], sources[code]). Pro Annotation
+    fallen so 47 Byte an statt mehrerer hundert für ein Annotation-Objekt mit Tupel und Strings.
+    """
+
+    COLUMNS = {
+        "video_id": (np.int32, ()),
+        "frame": (np.int32, ()),
+        "box": (np.int32, (4,)),
+        "track_id": (np.int64, ()),
+        "confidence": (np.float32, ()),
+        "label_code": (np.int16, ()),
+        "source_code": (np.int8, ()),
+        "annotation_id": (np.int64, ()),
+    }
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self.capacity = max(capacity, 1)
+        for name, (dtype, shape) in self.COLUMNS.items():
+            setattr(self, "_" + name, np.empty((self.capacity,) + shape, dtype=dtype))
+        self.labels, self.label_codes = [], {}
+        self.sources, self.source_codes = [], {}
+        self.next_id = 1
+
+    # Öffentliche Spalten sind immer auf die belegte Länge zugeschnitten (Views, keine Kopien)
+    def __getattr__(self, name):
+        if name in AnnotationTable.COLUMNS:
+            return self.__dict__["_" + name][:self.size]
+        raise AttributeError(name)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for i in range(self.size):
+            yield AnnotationRow(self, i)
+
+    def row(self, index: int) -> AnnotationRow:
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        return AnnotationRow(self, index)
+
+    def label_code_for(self, label: str) -> int:
+        return self._intern(label, self.labels, self.label_codes)
+
+    def source_code_for(self, source: str) -> int:
+        return self._intern(source, self.sources, self.source_codes)
+
+    def append(self, annotation: Annotation, confidence: float | None = None) -> int:
+        self.append_columns(
+            annotation.video_id, annotation.frame, [annotation.box], [annotation.label], annotation.source,
+            track_ids=[NO_TRACK if annotation.track_id is None else int(annotation.track_id)],
+            confidences=[np.nan if confidence is None else confidence],
+            annotation_ids=None if annotation.annotation_id is None else [annotation.annotation_id],
+        )
+        return self.size - 1
+
+    def append_detections(self, video_id: int, frame: int, detections, source: str = "yolo"):
+        """Bulk-Append der Ausgabe von YOLOv8Detector.detect() bzw. DeepSortTracker.update()."""
+        if not detections:
+            return
+        self.append_columns(
+            video_id, frame,
+            [d["box"] for d in detections],
+            [d["label"] for d in detections],
+            source,
+            track_ids=[int(d.get("track_id", NO_TRACK)) for d in detections],
+            confidences=[d.get("confidence", np.nan) for d in detections],
+        )
+
+    def append_columns(self, video_id, frame, boxes, labels, source: str,
+                       track_ids=None, confidences=None, annotation_ids=None):
+        """Vektorisierter Kern: frame/video_id dürfen Skalare oder Arrays sein, labels Strings oder Codes."""
+        boxes = np.asarray(boxes, dtype=np.int32).reshape(-1, 4)
+        n = len(boxes)
+        if n == 0:
+            return
+
+        labels = np.asarray(labels)
+        if labels.dtype.kind in "iu":
+            label_codes = labels.astype(np.int16)
+        else:
+            # Nur die eindeutigen Labels internieren, dann per Index zurückmappen
+            unique, inverse = np.unique(labels, return_inverse=True)
+            codes = np.array([self.label_code_for(str(label)) for label in unique], dtype=np.int16)
+            label_codes = codes[inverse]
+
+        self._reserve(n)
+        start, end = self.size, self.size + n
+        self._video_id[start:end] = video_id
+        self._frame[start:end] = frame
+        self._box[start:end] = boxes
+        self._label_code[start:end] = label_codes
+        self._source_code[start:end] = self.source_code_for(source)
+        self._track_id[start:end] = NO_TRACK if track_ids is None else track_ids
+        self._confidence[start:end] = np.nan if confidences is None else confidences
+
+        if annotation_ids is None:
+            self._annotation_id[start:end] = np.arange(self.next_id, self.next_id + n)
+            self.next_id += n
+        else:
+            self._annotation_id[start:end] = annotation_ids
+            self.next_id = max(self.next_id, int(np.max(annotation_ids)) + 1)
+
+        self.size = end
+
+    def mask(self, frame=None, label=None, source=None, min_confidence=None, track_id=None) -> np.ndarray:
+        """Boolesche Maske über alle Zeilen; alle Filter sind Array-Vergleiche."""
+        mask = np.ones(self.size, dtype=bool)
+        if frame is not None:
+            mask &= self.frame == frame
+        if label is not None:
+            code = self.label_codes.get(label)
+            mask &= False if code is None else self.label_code == code
+        if source is not None:
+            code = self.source_codes.get(source)
+            mask &= False if code is None else self.source_code == code
+        if min_confidence is not None:
+            mask &= self.confidence >= min_confidence  # NaN (manuell) fällt hier heraus
+        if track_id is not None:
+            mask &= self.track_id == track_id
+        return mask
+
+    def select(self, **filters) -> np.ndarray:
+        return np.flatnonzero(self.mask(**filters))
+
+    def frames(self):
+        return np.unique(self.frame).tolist()
+
+    def iter_frames(self, frames=None):
+        """(frame, rows) in Frame-Reihenfolge; einmal stabil sortieren statt pro Frame zu maskieren."""
+        indices = np.arange(self.size)
+        if frames is not None:
+            indices = indices[np.isin(self.frame, list(frames))]
+        order = indices[np.argsort(self.frame[indices], kind="stable")]
+        sorted_frames = self.frame[order]
+        starts = np.flatnonzero(np.r_[True, sorted_frames[1:] != sorted_frames[:-1]]) if len(order) else []
+        bounds = list(starts) + [len(order)]
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            yield int(sorted_frames[start]), self.rows(order[start:end])
+
+    def rows(self, indices):
+        return [AnnotationRow(self, int(i)) for i in indices]
+
+    def to_annotations(self, indices=None):
+        if indices is None:
+            indices = range(self.size)
+        return [AnnotationRow(self, int(i)).to_annotation() for i in indices]
+
+    def delete(self, mask: np.ndarray):
+        """Entfernt alle Zeilen, bei denen mask True ist (Spalten werden kompaktiert)."""
+        keep = np.flatnonzero(~mask)
+        for name in self.COLUMNS:
+            column = self.__dict__["_" + name]
+            column[:len(keep)] = column[keep]
+        self.size = len(keep)
+
+    def take(self, indices) -> "AnnotationTable":
+        table = AnnotationTable(capacity=len(indices))
+        for name in self.COLUMNS:
+            table.__dict__["_" + name][:len(indices)] = getattr(self, name)[indices]
+        table.size = len(indices)
+        table.labels, table.label_codes = list(self.labels), dict(self.label_codes)
+        table.sources, table.source_codes = list(self.sources), dict(self.source_codes)
+        table.next_id = self.next_id
+        return table
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.COLUMNS)
+
+    def save(self, path: str):
+        np.savez_compressed(
+            path,
+            labels=np.array(self.labels, dtype=str),
+            sources=np.array(self.sources, dtype=str),
+            **{name: getattr(self, name) for name in self.COLUMNS},
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "AnnotationTable":
+        data = np.load(path)
+        size = len(data["frame"])
+        table = cls(capacity=size)
+        for name in cls.COLUMNS:
+            table.__dict__["_" + name][:size] = data[name]
+        table.size = size
+        table.labels = [str(label) for label in data["labels"]]
+        table.label_codes = {label: i for i, label in enumerate(table.labels)}
+        table.sources = [str(source) for source in data["sources"]]
+        table.source_codes = {source: i for i, source in enumerate(table.sources)}
+        table.next_id = int(table.annotation_id.max()) + 1 if size else 1
+        return table
+
+    def _reserve(self, extra: int):
+        needed = self.size + extra
+        if needed <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name, (dtype, shape) in self.COLUMNS.items():
+            column = np.empty((capacity,) + shape, dtype=dtype)
+            column[:self.size] = self.__dict__["_" + name][:self.size]
+            self.__dict__["_" + name] = column
+        self.capacity = capacity
+
+    @staticmethod
+    def _intern(value, values, codes) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = len(values)
+            values.append(value)
+            codes[value] = code
+        return code
@@ -0,0 +1,56 @@
+# labeling/interpolation.py - Lineare Interpolation von Boxen zwischen Keyframes (ein NumPy-Durchlauf pro Objekt)
+
+import numpy as np
+
+from labeling.annotation import Annotation
+
+INTERPOLATED_SOURCE = "interpolated"  # erzeugte Boxen; werden bei jeder Keyframe-Änderung neu berechnet
+
+
+def interpolate_boxes(key_frames, key_boxes, frames=None):
+    """Boxen (x1, y1, x2, y2) für frames aus den Keyframes linear interpolieren.
+
+    frames=None → alle Frames zwischen erstem und letztem Keyframe, die selbst kein Keyframe sind.
+    Liefert (frames, boxes) als int-Arrays; Frames außerhalb der Keyframe-Spanne fallen weg.
+    """
+    key_frames = np.asarray(key_frames, dtype=np.int64)
+    key_boxes = np.asarray(key_boxes, dtype=np.float64).reshape(-1, 4)
+
+    order = np.argsort(key_frames, kind="stable")
+    key_frames, key_boxes = key_frames[order], key_boxes[order]
+    # Mehrere Keyframes im selben Frame → der zuletzt angelegte gilt
+    last = np.r_[key_frames[1:] != key_frames[:-1], True]
+    key_frames, key_boxes = key_frames[last], key_boxes[last]
+
+    if len(key_frames) < 2:
+        return np.empty(0, dtype=np.int64), np.empty((0, 4), dtype=np.int32)
+
+    if frames is None:
+        frames = np.arange(key_frames[0] + 1, key_frames[-1], dtype=np.int64)
+        frames = frames[~np.isin(frames, key_frames)]
+    else:
+        frames = np.asarray(frames, dtype=np.int64)
+        frames = frames[(frames >= key_frames[0]) & (frames <= key_frames[-1])]
+
+    # Segment pro Ziel-Frame, danach alles in einem Schritt: b0 + t * (b1 - b0)
+    segment = np.clip(np.searchsorted(key_frames, frames, side="right") - 1, 0, len(key_frames) - 2)
+    f0, f1 = key_frames[segment], key_frames[segment + 1]
+    t = ((frames - f0) / (f1 - f0))[:, None]
+    boxes = key_boxes[segment] + t * (key_boxes[segment + 1] - key_boxes[segment])
+    return frames, np.rint(boxes).astype(np.int32)
+
+
+def regenerate_track(store, video_id: int, label: str, track_id: int, key_source: str = "manual") -> int:
+    """Ersetzt alle interpolierten Boxen eines Objekts anhand seiner aktuellen Keyframes.
+
+    Keyframes = Annotationen aus key_source mit gleichem label und track_id. Liefert die Anzahl
+    erzeugter Boxen.
+    """
+    for ann in store.get_by_track(label, track_id, INTERPOLATED_SOURCE):
+        store.delete_annotation(ann.annotation_id)
+
+    keys = store.get_by_track(label, track_id, key_source)
+    frames, boxes = interpolate_boxes([ann.frame for ann in keys], [ann.box for ann in keys])
+    for frame, box in zip(frames.tolist(), boxes.tolist()):
+        store.add_annotation(Annotation(video_id, frame, label, tuple(box), INTERPOLATED_SOURCE, track_id))
+    return len(frames)
@@ -6,12 +6,15 @@ import time
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QLabel, QComboBox, QVBoxLayout, QWidget, QPushButton, QHBoxLayout
 )
-from PyQt5.QtGui import QPainter, QPen, QColor
+from PyQt5.QtGui import QPainter, QPen, QColor, QPixmap, QRegion
 from PyQt5.QtCore import Qt, QRect, QPoint, QTimer
 
 from labeling.models import Box
 from labeling.label_manager import LabelManager
 from labeling.selection_manager import SelectionManager
+from utils.tracing import tracer, traced
+from utils.qt_tracing import attach_status_summary
+from config import TRACE_FILE
 
 # Basisfarben pro Label
 LABEL_COLORS = {
@@ -67,6 +70,9 @@ class LabelDrawer(QMainWindow):
         container.setLayout(layout)
         self.setCentralWidget(container)
 
+        # Zeichenzeit in der Statusleiste (nur bei aktivem Tracing)
+        self.trace_timer = attach_status_summary(self, ["paint"])
+
     def change_label(self, index):
         self.current_label = self.labels[index]
 
@@ -80,6 +86,14 @@ class LabelDrawer(QMainWindow):
         self.label_manager.save_project(os.path.join(output_dir, "boundings.json"))
         self.statusBar().showMessage(f"✅ Projekt gespeichert unter {output_dir}")
 
+    def closeEvent(self, event):
+        # Autosave-Journal in den Snapshot kompaktieren
+        self.label_manager.close()
+        if tracer.enabled:
+            count = tracer.dump(TRACE_FILE)
+            print(f"ℹ️ Trace mit {count} Spans gespeichert unter {TRACE_FILE}")
+        super().closeEvent(event)
+
 class Canvas(QLabel):
     def __init__(self, parent):
         super().__init__()
@@ -93,11 +107,108 @@ class Canvas(QLabel):
         self.blink_interval_ms = 100  # alle 100ms togglen
 
         self.setStyleSheet("background-color: #aaaaaa;")
-        
+
+        # Layer-Rendering: statische Boxen liegen vorgerendert in einer Pixmap,
+        # Hover/Auswahl/Blinken/Aufziehen werden darüber gezeichnet
+        self.static_layer = None
+        self.static_key = None
+        self.lifted = set()  # id() der Shapes, die gerade nicht in der statischen Pixmap stehen
+        self.overlay_rect = QRect()  # Bereich, den die Overlays beim letzten Zeichnen belegt haben
+        self.mouse_pos = None
 
     def toggle_blink(self):
         self.blink_state = not self.blink_state
-        self.update()
+        # Nur die blinkende Ecke neu zeichnen
+        sm = self.parent.selection_manager
+        if sm.active_shape is not None and sm.hovered_corner_index is not None:
+            point = sm.active_shape.get_corner_points()[sm.hovered_corner_index]
+            self.update(QRect(point.x() - 7, point.y() - 7, 15, 15))
+
+    def overlay_shapes(self):
+        sm = self.parent.selection_manager
+        return [
+            shape for shape in self.parent.label_manager.get_shapes(self.parent.current_frame)
+            if shape.pending_delete or sm.is_shape_active(shape) or sm.is_shape_hovered(shape)
+        ]
+
+    def shape_bounds(self, shape):
+        # Box + Label-Text darüber + Eckpunkte (Radius 5) + Stiftbreite
+        text = f"{shape.label} #{shape.shape_id}"
+        metrics = self.fontMetrics()
+        text_rect = QRect(shape.rect.left() + 5, shape.rect.top() - 5 - metrics.ascent(),
+                          metrics.horizontalAdvance(text), metrics.height())
+        return shape.rect.united(text_rect).adjusted(-8, -8, 8, 8)
+
+    def current_overlay_rect(self):
+        rect = QRect()
+        for shape in self.overlay_shapes():
+            rect = rect.united(self.shape_bounds(shape))
+        if self.parent.start_pos and self.mouse_pos:
+            rect = rect.united(QRect(self.parent.start_pos, self.mouse_pos).normalized().adjusted(-2, -2, 2, 2))
+        return rect
+
+    def refresh_overlay(self, *extra_rects):
+        """Statt update(): nur alten und neuen Overlay-Bereich (plus extra_rects) neu zeichnen."""
+        new_rect = self.current_overlay_rect()
+        region = QRegion(self.overlay_rect).united(QRegion(new_rect))
+        for rect in extra_rects:
+            region = region.united(QRegion(rect))
+        self.overlay_rect = new_rect
+        if not region.isEmpty():
+            self.update(region)
+
+    def ensure_static_layer(self):
+        """Statische Pixmap mit allen Shapes außer den Overlay-Shapes (Hover/Auswahl/Löschen).
+
+        Voll neu gerendert wird nur bei Frame-, Shape- oder Größenänderung. Wechselt nur, welche Shapes
+        im Overlay liegen, werden lediglich deren Bereiche lokal neu gezeichnet.
+        """
+        frame = self.parent.current_frame
+        shapes = self.parent.label_manager.get_shapes(frame)
+        lifted = {id(shape) for shape in self.overlay_shapes()}
+        key = (frame, self.parent.label_manager.frame_version(frame), self.width(), self.height())
+
+        if key != self.static_key:
+            dpr = self.devicePixelRatioF()
+            pixmap = QPixmap(int(self.width() * dpr), int(self.height() * dpr))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.transparent)
+            self.static_layer = pixmap
+            self.static_key = key
+            self.lifted = lifted
+            self.draw_static(shapes)
+            return
+
+        if lifted == self.lifted:
+            return
+
+        # Hover/Auswahl gewechselt → nur die Bereiche der betroffenen Shapes neu zeichnen
+        changed = lifted ^ self.lifted
+        rect = QRect()
+        for shape in shapes:
+            if id(shape) in changed:
+                rect = rect.united(self.shape_bounds(shape))
+        self.lifted = lifted
+        if not rect.isEmpty():
+            self.draw_static(shapes, rect)
+
+    def draw_static(self, shapes, rect=None):
+        """Zeichnet alle nicht angehobenen Shapes in die statische Pixmap, mit rect nur diesen Bereich."""
+        painter = QPainter(self.static_layer)
+        if rect is not None:
+            painter.setCompositionMode(QPainter.CompositionMode_Source)
+            painter.fillRect(rect, Qt.transparent)
+            painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+            painter.setClipRect(rect)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setFont(self.font())
+        for shape in shapes:
+            if id(shape) in self.lifted:
+                continue
+            if rect is not None and not self.shape_bounds(shape).intersects(rect):
+                continue
+            shape.draw(painter)
+        painter.end()
 
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
@@ -136,16 +247,15 @@ class Canvas(QLabel):
 
                     self.blink_timer.stop()
                     self.blink_state = True
-                    self.parent.label_manager.save_project()
-                    self.update()
+                    self.refresh_overlay()
                     return
                 else:
                     # Normal: Resize beenden
                     self.parent.selection_manager.stop_resizing()
                     self.blink_timer.stop()
                     self.blink_state = True
-                    self.parent.label_manager.save_project()
-                    self.update()
+                    self.parent.label_manager.shape_changed(self.parent.current_frame, shape, "resize")
+                    self.refresh_overlay()
                     return
             
             if self.parent.selection_manager.moving:
@@ -154,13 +264,12 @@ class Canvas(QLabel):
                     self.parent.label_manager.delete_shape(self.parent.current_frame, shape)
                     self.parent.selection_manager.clear_selection()
                     self.setCursor(Qt.ArrowCursor)
-                    self.parent.label_manager.save_project()
-                    self.update()
+                    self.refresh_overlay()
                     return
                 self.parent.selection_manager.clear_selection()
                 self.setCursor(Qt.ArrowCursor)
-                self.parent.label_manager.save_project()
-                self.update()
+                self.parent.label_manager.shape_changed(self.parent.current_frame, shape, "move")
+                self.refresh_overlay()
                 return
 
             if self.parent.start_pos:
@@ -175,35 +284,31 @@ class Canvas(QLabel):
                 self.parent.label_manager.add_shape(self.parent.current_frame, box)
 
                 self.parent.start_pos = None
-                self.parent.label_manager.save_project()
-                self.update()
+                self.refresh_overlay(self.shape_bounds(box))
 
     def check_hovered_corner(self, pos, tolerance=10):
-        shapes = self.parent.label_manager.get_shapes(self.parent.current_frame)
-        for shape in shapes:
-            for idx, corner in enumerate(shape.get_corner_points()):
-                if (corner - pos).manhattanLength() <= tolerance:
-                    return idx
-        return None      
+        _, idx = self.parent.label_manager.find_corner_hit(self.parent.current_frame, pos, tolerance)
+        return idx
 
     def map_to_frame_coordinates(self, pos):
         return pos  # aktuell direkte 1:1 Zuordnung, später zoombereit machen
 
     def mouseMoveEvent(self, event):
         frame_pos = self.map_to_frame_coordinates(event.pos())
+        self.mouse_pos = event.pos()
 
         if self.parent.selection_manager.resizing:
             self.parent.selection_manager.move_resize(event.pos())
             # >>> Hier löschen prüfen:
             self.parent.selection_manager.check_pending_delete()
-            self.update()
+            self.refresh_overlay()
             return
 
         if self.parent.selection_manager.moving:
             self.parent.selection_manager.move_active_shape(event.pos())
             # >>> Hier löschen prüfen:
             self.parent.selection_manager.check_pending_delete()
-            self.update()
+            self.refresh_overlay()
             return
 
         # Hover-Detection
@@ -214,22 +319,23 @@ class Canvas(QLabel):
         corner_hit = self.check_hovered_corner(frame_pos)
         self.parent.selection_manager.set_hovered_corner(corner_hit)
 
-        self.update()
+        self.refresh_overlay()
         self.parent.statusBar().showMessage(f"X: {event.x()} | Y: {event.y()}")
 
+    @traced("paint")
     def paintEvent(self, event):
         super().paintEvent(event)
+        self.ensure_static_layer()
+
+        # Qt beschränkt das Zeichnen automatisch auf die Dirty-Region (event.region())
         painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.static_layer)
         painter.setRenderHint(QPainter.Antialiasing)
 
-        shapes = self.parent.label_manager.get_shapes(self.parent.current_frame)
-        for shape in shapes:
+        for shape in self.overlay_shapes():
             active = self.parent.selection_manager.is_shape_active(shape)
             hovered = self.parent.selection_manager.is_shape_hovered(shape)
 
-            # Zuerst normale Box zeichnen
-            #shape.draw(painter, active=active, hovered=hovered)
-
             # Wenn Shape "pending delete" ist → eigenen Stil
             if shape.pending_delete:
                 pen = QPen(QColor(255, 0, 0, 100))  # leicht rot, halbtransparent
@@ -261,7 +367,7 @@ class Canvas(QLabel):
                     painter.restore()  # <<< Restore Pen/Brush sauber zurück
 
         if self.parent.start_pos:
-            mouse_pos = self.mapFromGlobal(self.cursor().pos())
+            mouse_pos = self.mouse_pos or self.mapFromGlobal(self.cursor().pos())
             rect = QRect(self.parent.start_pos, mouse_pos).normalized()
             pen = QPen(QColor(128, 128, 128), 1, Qt.DashLine)
             painter.setPen(pen)
@@ -3,6 +3,11 @@
 import json
 import os
 from labeling.models import Box
+from labeling.project_journal import (
+    ProjectJournal, JsonSnapshot, journal_path_for, read_journal, apply_op, empty_state, state_from_save_data
+)
+from labeling.project_store import SqliteProjectStore, SqliteSnapshot, is_sqlite_project, fold_journal
+from labeling.spatial_index import ShapeGrid
 from PyQt5.QtGui import QColor
 
 class LabelManager:
@@ -10,15 +15,65 @@ class LabelManager:
         self.frames = {}  # frame_index -> List[Shapes]
         self.label_colors = {}  # {label: QColor}
         self.label_counters = {}  # {label: int}
+        self.journal = None  # ProjectJournal, sobald Autosave aktiv ist
+        self.store = None  # SqliteProjectStore bei .db-Projekten
+        self.lazy_frames = set()  # Frames, die noch nur in self.store liegen
+        self.indexes = {}  # frame_index -> ShapeGrid (wird beim ersten Hit-Test aufgebaut)
+        self.frame_versions = {}  # frame_index -> Zähler, steigt bei jeder Änderung (für Render-Caches)
+        self.generation = 0
 
     def add_shape(self, frame_index: int, shape):
+        self._materialize(frame_index)
         if frame_index not in self.frames:
             self.frames[frame_index] = []
         self.frames[frame_index].append(shape)
+        self._touch(frame_index)
+        if frame_index in self.indexes:
+            self.indexes[frame_index].insert(shape)
+        if self.journal:
+            self.journal.record("add", frame_index, shape)
+
+    def shape_changed(self, frame_index: int, shape, op="move"):
+        """Nach Verschieben ("move") oder Skalieren ("resize") einer Shape aufrufen."""
+        self._touch(frame_index)
+        if self.journal:
+            self.journal.record(op, frame_index, shape)
 
     def get_shapes(self, frame_index: int):
+        self._materialize(frame_index)
         return self.frames.get(frame_index, [])
 
+    def update_shape_index(self, frame_index: int, shape):
+        """Nach jeder Änderung von shape.rect aufrufen (Move/Resize)."""
+        if frame_index in self.indexes:
+            self.indexes[frame_index].update(shape)
+
+    def frame_version(self, frame_index: int):
+        return self.generation, self.frame_versions.get(frame_index, 0)
+
+    def _touch(self, frame_index: int):
+        self.frame_versions[frame_index] = self.frame_versions.get(frame_index, 0) + 1
+
+    def _index_for(self, frame_index: int):
+        if frame_index not in self.indexes:
+            grid = ShapeGrid()
+            for shape in self.get_shapes(frame_index):
+                if hasattr(shape, "rect"):
+                    grid.insert(shape)
+            self.indexes[frame_index] = grid
+        return self.indexes[frame_index]
+
+    def frame_indices(self):
+        return sorted(set(self.frames) | self.lazy_frames)
+
+    def _materialize(self, frame_index: int):
+        # Shapes eines .db-Projekts erst beim ersten Zugriff als Box-Objekte erzeugen
+        if frame_index in self.lazy_frames:
+            self.lazy_frames.discard(frame_index)
+            self.frames[frame_index] = [
+                Box.from_dict(d) for d in self.store.load_frame(frame_index) if d.get("type") == "box"
+            ]
+
     def get_label_color(self, label):
         if label not in self.label_colors:
             # Erzeuge eine neue zufällige Farbe wenn Label neu ist
@@ -37,16 +92,23 @@ class LabelManager:
 
     def clear(self):
         self.frames = {}
+        self.lazy_frames = set()
+        self.indexes = {}
+        self.generation += 1  # macht alle bisherigen frame_version()-Werte ungültig
 
 
     def save_project(self, path="data/output/project.json"):
         os.makedirs(os.path.dirname(path), exist_ok=True)
 
+        if is_sqlite_project(path):
+            self._save_sqlite(path)
+            return
+
         frames_data = []
-        for frame_idx, shapes in self.frames.items():
+        for frame_idx in self.frame_indices():
             frames_data.append({
                 "frame_index": frame_idx,
-                "shapes": [shape.to_dict() for shape in shapes]
+                "shapes": [shape.to_dict() for shape in self.get_shapes(frame_idx)]
             })
 
         save_data = {
@@ -54,24 +116,50 @@ class LabelManager:
             "counters": self.label_counters  # <<< einfach dumpen
         }
 
-        with open(path, "w") as f:
+        # Atomar ersetzen, damit ein Absturz beim Schreiben keine halbe Datei hinterlässt
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
             json.dump(save_data, f, indent=4)
+        os.replace(tmp_path, path)
+
+    def _save_sqlite(self, path):
+        # In die eigene .db müssen nur geladene Frames zurück, alle anderen sind dort unverändert
+        same_store = self.store is not None and os.path.abspath(path) == os.path.abspath(self.store.path)
+        frame_indices = self.frames if same_store else self.frame_indices()
+        store = self.store if same_store else SqliteProjectStore(path)
+        store.write_frames(
+            {f: [shape.to_dict() for shape in self.get_shapes(f)] for f in list(frame_indices)},
+            self.label_counters
+        )
+        if not same_store:
+            store.close()
 
     def load_project(self, path="data/output/project.json"):
-        if not os.path.exists(path):
+        if is_sqlite_project(path):
+            self._load_sqlite(path)
+            return
+
+        journal_ops = read_journal(journal_path_for(path))
+        if not os.path.exists(path) and not journal_ops:
             print(f"ℹ️ Keine Projektdatei gefunden unter {path}. Starte leer.")
             return
 
-        with open(path, "r") as f:
-            data = json.load(f)
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                state = state_from_save_data(json.load(f))
+        else:
+            state = empty_state()
+
+        # Snapshot + Journal = aktueller Stand
+        for op in journal_ops:
+            apply_op(state, op)
 
-        self.frames.clear()
+        self.clear()
         self.label_counters.clear()
 
-        for frame_data in data.get("frames", []):
-            frame_idx = frame_data["frame_index"]
+        for frame_idx, frame_shapes in state["frames"].items():
             shapes = []
-            for shape_data in frame_data["shapes"]:
+            for shape_data in frame_shapes.values():
                 if shape_data.get("type") == "box":
                     shape = Box.from_dict(shape_data)
                     shapes.append(shape)
@@ -79,24 +167,87 @@ class LabelManager:
             self.frames[frame_idx] = shapes
 
         # Counters wiederherstellen
-        self.label_counters.update(data.get("counters", {}))
+        self.label_counters.update(state["counters"])
 
-        print(f"✅ Projekt geladen aus {path}")
+        if journal_ops:
+            print(f"✅ Projekt geladen aus {path} (+{len(journal_ops)} Journal-Einträge)")
+        else:
+            print(f"✅ Projekt geladen aus {path}")
+
+    def _load_sqlite(self, path):
+        # Liegengebliebenes Journal zuerst einspielen, dann nur den Frame-Index lesen
+        replayed = fold_journal(path)
+
+        if self.store:
+            self.store.close()
+        self.store = SqliteProjectStore(path)
+        self.clear()
+        self.lazy_frames = set(self.store.frame_indices())
+        self.label_counters.clear()
+        self.label_counters.update(self.store.load_counters())
+
+        print(f"✅ Projekt geladen aus {path} ({len(self.lazy_frames)} Frames, +{replayed} Journal-Einträge)")
+
+    def enable_autosave(self, path="data/output/project.json", compact_every=1000):
+        """Änderungen ab jetzt im Hintergrund journalisieren statt save_project() pro Edit."""
+        if self.journal:
+            return
+
+        if is_sqlite_project(path):
+            # Kompaktierung schreibt nur geänderte Frames in die .db, die übrigen müssen dort schon liegen
+            if self.store is None or os.path.abspath(path) != os.path.abspath(self.store.path):
+                self.save_project(path)
+            snapshot = SqliteSnapshot(path)
+        else:
+            state = empty_state()
+            for frame_idx in self.frame_indices():
+                for shape in self.get_shapes(frame_idx):
+                    apply_op(state, {"op": "add", "frame": frame_idx, "shape": shape.to_dict()})
+            state["counters"].update(self.label_counters)
+            snapshot = JsonSnapshot(path, state)
+
+        self.journal = ProjectJournal(path, snapshot, compact_every)
+
+    def close(self):
+        """Journal leeren und in den Snapshot kompaktieren (beim Beenden aufrufen)."""
+        if self.journal:
+            self.journal.close()
+            if hasattr(self.journal.snapshot, "close"):
+                self.journal.snapshot.close()
+            self.journal = None
+        if self.store:
+            self.store.close()
+            self.store = None
 
 
     def find_shape_border_hit(self, frame_index: int, pos, tolerance=5):
-        shapes = self.get_shapes(frame_index)
+        # Nur die Shapes aus der Rasterzelle unter pos prüfen
+        shapes = self._index_for(frame_index).query(pos)
         for shape in shapes:
             if hasattr(shape, "is_point_near_border") and shape.is_point_near_border(pos, tolerance):
                 return shape
         return None
+
+    def find_corner_hit(self, frame_index: int, pos, tolerance=10):
+        """Liefert (shape, corner_index) der ersten Ecke im Manhattan-Abstand <= tolerance, sonst (None, None)."""
+        for shape in self._index_for(frame_index).query(pos):
+            for idx, corner in enumerate(shape.get_corner_points()):
+                if (corner - pos).manhattanLength() <= tolerance:
+                    return shape, idx
+        return None, None
     
     def delete_shape(self, frame_idx, shape):
+        self._materialize(frame_idx)
         if frame_idx not in self.frames:
             return
 
         if shape in self.frames[frame_idx]:
             self.frames[frame_idx].remove(shape)
+            self._touch(frame_idx)
+            if frame_idx in self.indexes:
+                self.indexes[frame_idx].remove(shape)
+            if self.journal:
+                self.journal.record("delete", frame_idx, shape)
 
 
 
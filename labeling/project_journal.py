@@ -0,0 +1,209 @@
+# labeling/project_journal.py - Append-only Änderungsjournal mit Hintergrund-Writer und Kompaktierung
+
+import json
+import os
+import queue
+import threading
+import time
+
+# Operationen: add / move / resize / delete. Alle sind idempotent (letzter Schreiber gewinnt pro Shape),
+# dadurch ist ein erneutes Abspielen des Journals nach einem Absturz während der Kompaktierung harmlos.
+SHAPE_OPS = ("add", "move", "resize")
+
+
+def journal_path_for(project_path: str) -> str:
+    return os.path.splitext(project_path)[0] + ".journal"
+
+
+def shape_key(label, shape_id):
+    return f"{label}#{shape_id}"
+
+
+def empty_state():
+    return {"frames": {}, "counters": {}}
+
+
+def state_from_save_data(data: dict) -> dict:
+    """project.json-Inhalt → {frames: {frame: {key: shape_dict}}, counters}"""
+    state = empty_state()
+    for frame_data in data.get("frames", []):
+        shapes = state["frames"].setdefault(frame_data["frame_index"], {})
+        for shape_data in frame_data["shapes"]:
+            shapes[shape_key(shape_data["label"], shape_data["id"])] = shape_data
+    state["counters"].update(data.get("counters", {}))
+    return state
+
+
+def state_to_save_data(state: dict) -> dict:
+    return {
+        "frames": [
+            {"frame_index": frame_idx, "shapes": list(shapes.values())}
+            for frame_idx, shapes in state["frames"].items()
+            if shapes
+        ],
+        "counters": state["counters"],
+    }
+
+
+def apply_op(state: dict, op: dict):
+    frame_idx = op["frame"]
+    if op["op"] in SHAPE_OPS:
+        shape = op["shape"]
+        state["frames"].setdefault(frame_idx, {})[shape_key(shape["label"], shape["id"])] = shape
+        counters = state["counters"]
+        counters[shape["label"]] = max(counters.get(shape["label"], 0), shape["id"])
+    elif op["op"] == "delete":
+        state["frames"].get(frame_idx, {}).pop(shape_key(op["label"], op["id"]), None)
+
+
+def read_journal(path: str):
+    if not os.path.exists(path):
+        return []
+
+    ops = []
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                ops.append(json.loads(line))
+            except json.JSONDecodeError:
+                break  # abgeschnittene letzte Zeile nach einem Absturz
+    return ops
+
+
+def coalesce(ops):
+    """Fasst Operationen auf dieselbe Shape zusammen (z.B. add + 20x move → ein add)."""
+    result = []
+    pending = {}  # (frame, key) -> Position in result
+
+    for op in ops:
+        if op["op"] == "delete":
+            key = (op["frame"], shape_key(op["label"], op["id"]))
+        else:
+            key = (op["frame"], shape_key(op["shape"]["label"], op["shape"]["id"]))
+        pos = pending.get(key)
+
+        if op["op"] in SHAPE_OPS:
+            if pos is not None and result[pos]["op"] != "delete":
+                result[pos] = dict(result[pos], shape=op["shape"])
+            else:
+                pending[key] = len(result)
+                result.append(op)
+        else:
+            if pos is not None and result[pos]["op"] == "add":
+                result[pos] = None  # im selben Batch angelegt und gelöscht → gar nicht schreiben
+                del pending[key]
+            elif pos is not None:
+                result[pos] = op
+            else:
+                pending[key] = len(result)
+                result.append(op)
+
+    return [op for op in result if op is not None]
+
+
+def write_snapshot(path: str, state: dict):
+    # Erst in Temp-Datei schreiben, dann atomar ersetzen → project.json ist nie halb geschrieben
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state_to_save_data(state), f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class JsonSnapshot:
+    """Snapshot als project.json; hält das komplette Projekt als Dict-Modell."""
+
+    def __init__(self, path: str, state: dict):
+        self.path = path
+        self.state = state
+
+    def apply(self, op: dict):
+        apply_op(self.state, op)
+
+    def write(self):
+        write_snapshot(self.path, self.state)
+
+
+class ProjectJournal:
+    """Schreibt Änderungen im Hintergrund ins Journal und kompaktiert regelmäßig in den Snapshot.
+
+    Der Writer-Thread führt über den Snapshot (JsonSnapshot, SqliteSnapshot) ein eigenes Modell des
+    Projekts mit, damit die Kompaktierung ohne Zugriff auf die Qt-Objekte des GUI-Threads auskommt.
+    """
+
+    def __init__(self, project_path: str, snapshot, compact_every: int = 1000, flush_interval: float = 0.5):
+        self.project_path = project_path
+        self.journal_path = journal_path_for(project_path)
+        self.compact_every = compact_every
+        self.flush_interval = flush_interval
+
+        self.snapshot = snapshot
+        self.ops_since_compact = len(read_journal(self.journal_path))
+        self.queue = queue.Queue()
+        self.error = None
+
+        os.makedirs(os.path.dirname(project_path) or ".", exist_ok=True)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def record(self, op: str, frame_index: int, shape):
+        if op == "delete":
+            entry = {"op": op, "frame": frame_index, "label": shape.label, "id": shape.shape_id}
+        else:
+            entry = {"op": op, "frame": frame_index, "shape": shape.to_dict()}
+        self.queue.put(entry)
+
+    def compact(self):
+        self.queue.put("compact")
+
+    def close(self):
+        self.queue.put("close")
+        self._thread.join()
+
+    def _run(self):
+        running = True
+        while running:
+            items = [self.queue.get()]
+            # Kurz sammeln, damit schnelle Edits in einem Schreibvorgang landen
+            deadline = time.monotonic() + self.flush_interval
+            while "close" not in items:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    items.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            ops = [item for item in items if isinstance(item, dict)]
+            compact_requested = "compact" in items
+            running = "close" not in items
+
+            try:
+                if ops:
+                    self._append(coalesce(ops))
+                if compact_requested or not running or self.ops_since_compact >= self.compact_every:
+                    self._compact()
+            except OSError as e:
+                self.error = e
+                print(f"❌ Autosave fehlgeschlagen: {e}")
+
+    def _append(self, ops):
+        with open(self.journal_path, "a") as f:
+            for op in ops:
+                f.write(json.dumps(op) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        for op in ops:
+            self.snapshot.apply(op)
+        self.ops_since_compact += len(ops)
+
+    def _compact(self):
+        if self.ops_since_compact == 0 and os.path.exists(self.project_path):
+            return
+        self.snapshot.write()
+        # Erst nach erfolgreichem Snapshot leeren; ein Absturz dazwischen spielt das Journal nur erneut ab
+        open(self.journal_path, "w").close()
+        self.ops_since_compact = 0
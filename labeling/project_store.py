@@ -0,0 +1,134 @@
+# labeling/project_store.py - Kompaktes SQLite-Projektformat mit Frame-Index (Frames werden erst bei Bedarf geladen)
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+from labeling.project_journal import apply_op, read_journal, journal_path_for, shape_key, state_from_save_data
+
+SQLITE_EXTENSIONS = (".db", ".sqlite")
+
+
+def is_sqlite_project(path: str) -> bool:
+    return path.lower().endswith(SQLITE_EXTENSIONS)
+
+
+class SqliteProjectStore:
+    """Eine Zeile pro Shape, Index über frame → get_shapes(frame) liest nur die Zeilen dieses Frames."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")  # Lesen im GUI-Thread während der Writer schreibt
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS shapes ("
+            "frame INTEGER NOT NULL, seq INTEGER NOT NULL, type TEXT, label TEXT, id INTEGER, "
+            "x1 INTEGER, y1 INTEGER, x2 INTEGER, y2 INTEGER, r INTEGER, g INTEGER, b INTEGER)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS shapes_frame ON shapes (frame, seq)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS counters (label TEXT PRIMARY KEY, value INTEGER)")
+        self.conn.commit()
+
+    def frame_indices(self):
+        with self.lock:
+            return [row[0] for row in self.conn.execute("SELECT DISTINCT frame FROM shapes")]
+
+    def load_frame(self, frame_index: int):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT type, label, id, x1, y1, x2, y2, r, g, b FROM shapes WHERE frame = ? ORDER BY seq",
+                (frame_index,),
+            ).fetchall()
+
+        return [
+            {"type": t, "label": label, "id": shape_id, "x1": x1, "y1": y1, "x2": x2, "y2": y2, "color": (r, g, b)}
+            for t, label, shape_id, x1, y1, x2, y2, r, g, b in rows
+        ]
+
+    def load_counters(self) -> dict:
+        with self.lock:
+            return dict(self.conn.execute("SELECT label, value FROM counters"))
+
+    def write_frames(self, frames: dict, counters: dict):
+        """Ersetzt die angegebenen Frames (frame_index -> Liste von Shape-Dicts) in einer Transaktion."""
+        with self.lock, self.conn:
+            for frame_idx, shapes in frames.items():
+                self.conn.execute("DELETE FROM shapes WHERE frame = ?", (frame_idx,))
+                self.conn.executemany(
+                    "INSERT INTO shapes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (frame_idx, seq, d.get("type", "box"), d["label"], d["id"],
+                         d["x1"], d["y1"], d["x2"], d["y2"], *d["color"])
+                        for seq, d in enumerate(shapes)
+                    ],
+                )
+            self.conn.executemany("INSERT OR REPLACE INTO counters VALUES (?, ?)", list(counters.items()))
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class SqliteSnapshot:
+    """Snapshot-Ziel für ProjectJournal: hält nur die seit der letzten Kompaktierung geänderten Frames."""
+
+    def __init__(self, path: str):
+        self.store = SqliteProjectStore(path)
+        self.counters = self.store.load_counters()
+        self.touched = {}  # frame_index -> {key: shape_dict}
+
+    def apply(self, op: dict):
+        frame_idx = op["frame"]
+        if frame_idx not in self.touched:
+            self.touched[frame_idx] = {shape_key(d["label"], d["id"]): d for d in self.store.load_frame(frame_idx)}
+        apply_op({"frames": self.touched, "counters": self.counters}, op)
+
+    def write(self):
+        self.store.write_frames({f: list(shapes.values()) for f, shapes in self.touched.items()}, self.counters)
+        self.touched.clear()
+
+    def close(self):
+        self.store.close()
+
+
+def fold_journal(db_path: str) -> int:
+    """Spielt ein vorhandenes Journal in die SQLite-Datei ein und leert es. Liefert die Anzahl der Einträge."""
+    journal_path = journal_path_for(db_path)
+    ops = read_journal(journal_path)
+    if not ops:
+        return 0
+
+    snapshot = SqliteSnapshot(db_path)
+    for op in ops:
+        snapshot.apply(op)
+    snapshot.write()
+    snapshot.close()
+    open(journal_path, "w").close()
+    return len(ops)
+
+
+def convert_json_to_sqlite(json_path: str, db_path: str):
+    """Konvertiert ein bestehendes project.json (inkl. Journal) ins SQLite-Format."""
+    with open(json_path, "r") as f:
+        state = state_from_save_data(json.load(f))
+    for op in read_journal(journal_path_for(json_path)):
+        apply_op(state, op)
+
+    store = SqliteProjectStore(db_path)
+    store.write_frames({f: list(shapes.values()) for f, shapes in state["frames"].items()}, state["counters"])
+    store.close()
+
+    shape_count = sum(len(shapes) for shapes in state["frames"].values())
+    print(f"✅ {shape_count} Shapes in {len(state['frames'])} Frames nach {db_path} konvertiert")
+
+
+if __name__ == "__main__":
+    # python -m labeling.project_store data/output/project.json data/output/project.db
+    if len(sys.argv) != 3:
+        print("Aufruf: python -m labeling.project_store <project.json> <project.db>")
+        sys.exit(1)
+    convert_json_to_sqlite(sys.argv[1], sys.argv[2])
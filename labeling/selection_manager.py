@@ -48,6 +48,7 @@ class SelectionManager:
 
         if hasattr(self.active_shape, "rect"):
             self.active_shape.rect.translate(delta)
+            self.parent.label_manager.update_shape_index(self.parent.current_frame, self.active_shape)
 
     def clear_selection(self):
         self.active_shape = None
@@ -92,6 +93,7 @@ class SelectionManager:
             rect.setHeight(max(rect.height(), min_size))
 
         self.active_shape.rect = rect
+        self.parent.label_manager.update_shape_index(self.parent.current_frame, self.active_shape)
     
     def check_pending_delete(self):
         if not self.active_shape:
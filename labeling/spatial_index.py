@@ -0,0 +1,73 @@
+# labeling/spatial_index.py - Uniformes Raster für Hover-/Hit-Tests auf Box-Rändern und Ecken
+
+from collections import defaultdict
+
+
+class ShapeGrid:
+    """Ordnet jede Shape den Rasterzellen zu, die ihr Rand (± margin) berührt.
+
+    Eine Abfrage prüft damit nur die Shapes der Zelle unter dem Mauszeiger statt aller
+    Shapes im Frame. margin muss mindestens so groß sein wie die Toleranz der Abfragen.
+    """
+
+    def __init__(self, cell_size: int = 64, margin: int = 16):
+        self.cell_size = cell_size
+        self.margin = margin
+        self.cells = defaultdict(set)  # (cx, cy) -> {id(shape)}
+        self.entries = {}              # id(shape) -> (shape, cells, seq)
+        self.next_seq = 0
+
+    def insert(self, shape):
+        seq = self.next_seq
+        self.next_seq += 1
+        self._add(shape, seq)
+
+    def remove(self, shape):
+        entry = self.entries.pop(id(shape), None)
+        if entry is None:
+            return
+        for cell in entry[1]:
+            bucket = self.cells[cell]
+            bucket.discard(id(shape))
+            if not bucket:
+                del self.cells[cell]
+
+    def update(self, shape):
+        # Nach Verschieben/Skalieren: Zellen neu berechnen, Reihenfolge beibehalten
+        entry = self.entries.get(id(shape))
+        if entry is None:
+            self.insert(shape)
+            return
+        self.remove(shape)
+        self._add(shape, entry[2])
+
+    def query(self, pos):
+        """Kandidaten in Einfügereihenfolge (wie die Shape-Liste des Frames)."""
+        cell = (pos.x() // self.cell_size, pos.y() // self.cell_size)
+        ids = self.cells.get(cell)
+        if not ids:
+            return []
+        entries = sorted((self.entries[i] for i in ids), key=lambda e: e[2])
+        return [e[0] for e in entries]
+
+    def _add(self, shape, seq):
+        cells = self._border_cells(shape.rect)
+        for cell in cells:
+            self.cells[cell].add(id(shape))
+        self.entries[id(shape)] = (shape, cells, seq)
+
+    def _border_cells(self, rect):
+        m, cs = self.margin, self.cell_size
+        left, right, top, bottom = rect.left(), rect.right(), rect.top(), rect.bottom()
+        strips = [
+            (left - m, left + m, top - m, bottom + m),      # linker Rand
+            (right - m, right + m, top - m, bottom + m),    # rechter Rand
+            (left - m, right + m, top - m, top + m),        # oberer Rand
+            (left - m, right + m, bottom - m, bottom + m),  # unterer Rand
+        ]
+        cells = set()
+        for x1, x2, y1, y2 in strips:
+            for cx in range(x1 // cs, x2 // cs + 1):
+                for cy in range(y1 // cs, y2 // cs + 1):
+                    cells.add((cx, cy))
+        return cells
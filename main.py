@@ -9,7 +9,9 @@ def main():
     app = QApplication(sys.argv)
 
     manager = LabelManager()
-    manager.load_project()   # <<< automatisch laden
+    project_path = sys.argv[1] if len(sys.argv) > 1 else "data/output/project.json"  # z.B. Projekt aus prelabel.py
+    manager.load_project(project_path)   # <<< automatisch laden
+    manager.enable_autosave(project_path)  # Änderungen laufen ab jetzt übers Journal
 
     window = LabelDrawer(manager)  # <<< manager übergeben
     window.show()
@@ -0,0 +1,160 @@
+# prelabel.py - Headless Vorlabeln aller Videos im Input-Ordner (YOLO + DeepSort)
+
+import argparse
+import os
+import time
+
+import cv2
+from PyQt5.QtCore import QRect
+
+from config import (
+    INPUT_FOLDER, OUTPUT_FOLDER, SUPPORTED_FORMATS, DETECTION_CACHE_FOLDER, MOTION_THRESHOLD,
+    DETECTOR_BACKEND, DETECTOR_INT8, DETECTOR_THREADS, ROI_ENABLED, ROI_REFRESH_INTERVAL, ROI_PADDING, ROI_MIN_SIZE,
+    ROI_MAX_AREA, ROI_ENTRY_ZONES,
+)
+from detection.backends import BACKENDS
+from detection.yolo8_wrapper import YOLOv8Detector
+from detection.detection_cache import DetectionCache
+from detection.scheduler import DetectionScheduler
+from detection.roi_detector import RoiDetector
+from tracking.deep_sort import DeepSortTracker
+from labeling.label_manager import LabelManager
+from labeling.models import Box
+from labeling.annotation_table import AnnotationTable
+
+
+def find_videos(input_folder):
+    if not os.path.isdir(input_folder):
+        return []
+    return sorted(
+        os.path.join(input_folder, name)
+        for name in os.listdir(input_folder)
+        if name.lower().endswith(SUPPORTED_FORMATS)
+    )
+
+
+def project_path_for(video_path, output_folder):
+    """Projektdatei pro Video: <output>/<videoname>/project.json"""
+    stem = os.path.splitext(os.path.basename(video_path))[0]
+    return os.path.join(output_folder, stem, "project.json")
+
+
+def add_tracked_box(manager: LabelManager, frame_index: int, tracked: dict):
+    label = tracked["label"]
+    x1, y1, x2, y2 = tracked["box"]
+    # Track-ID als Shape-ID → gleiche Nummer über alle Frames hinweg
+    shape_id = int(tracked["track_id"])
+    manager.label_counters[label] = max(manager.label_counters.get(label, 0), shape_id)
+
+    color = manager.get_label_color(label)
+    rect = QRect(x1, y1, x2 - x1, y2 - y1)
+    manager.add_shape(frame_index, Box(rect, label, shape_id, (color.red(), color.green(), color.blue())))
+
+
+def prelabel_video(video_path, output_path, detector: YOLOv8Detector, progress_every: int = 500,
+                   scheduler: DetectionScheduler | None = None, duplicates=None, roi: RoiDetector | None = None):
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        print(f"❌ Video {video_path} konnte nicht geöffnet werden.")
+        return 0
+
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    scheduler = scheduler or DetectionScheduler(stride=1)  # Standard: jeder Frame wird detektiert
+    tracker = DeepSortTracker()  # Tracker-Zustand gilt immer nur für ein Video
+    cache = DetectionCache(DETECTION_CACHE_FOLDER, video_path, detector.model_path, detector.raw_conf, duplicates,
+                           detector.variant)
+    manager = LabelManager()
+    table = AnnotationTable()  # kompakte Kopie aller Vorlabels für Export/Auswertung
+    frame_index = 0
+    start = time.perf_counter()
+
+    # Sequentiell dekodieren – kein Seek pro Frame; YOLO bekommt batch_size Frames pro Aufruf
+    finished = False
+    while not finished:
+        batch = []
+        while len(batch) < detector.batch_size:
+            success, frame = cap.read()
+            if not success:
+                finished = True
+                break
+            batch.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+        # Die Entscheidung hängt nur von den Frames ab → vorab für den ganzen Batch treffen,
+        # dann nur die ausgewählten Frames an YOLO geben. Rohdaten landen im Detection-Cache.
+        indices = list(range(frame_index, frame_index + len(batch)))
+        selected = [i for i, frame in enumerate(batch) if scheduler.should_detect(indices[i], frame)]
+        # Mit ROI hängen die Ausschnitte vom Trackerstand ab → dann erst in der Schleife pro Frame
+        if roi is None:
+            raws = cache.detect_batch(detector, [indices[i] for i in selected], [batch[i] for i in selected])
+            raw_by_offset = dict(zip(selected, raws))
+        else:
+            raw_by_offset = {}
+        selected = set(selected)
+
+        # Der Tracker muss die Frames weiterhin einzeln und in Reihenfolge sehen
+        for offset, frame in enumerate(batch):
+            raw = raw_by_offset.get(offset)
+            if roi is not None and offset in selected:
+                predicted, confirmed = tracker.predicted_boxes()
+                raw = roi.detect_raw(frame_index, frame, predicted, confirmed, cache)
+            if raw is None:
+                tracked_boxes = tracker.predict(frame)
+            else:
+                tracked_boxes = tracker.update(detector.filter_raw(raw), frame)
+            for tracked in tracked_boxes:
+                add_tracked_box(manager, frame_index, tracked)
+            table.append_detections(1, frame_index, tracked_boxes, source="yolo")
+
+            frame_index += 1
+            if progress_every and frame_index % progress_every == 0:
+                fps = frame_index / (time.perf_counter() - start)
+                print(f"   {frame_index}/{total} Frames ({fps:.1f} FPS)")
+
+    cap.release()
+    cache.close()
+    manager.save_project(output_path)
+    table.save(os.path.join(os.path.dirname(output_path), "annotations.npz"))
+    print(f"✅ {frame_index} Frames gelabelt, {len(table)} Boxen → {output_path} "
+          f"(YOLO auf {scheduler.inferred_fraction:.0%} der Frames"
+          + (f", {roi.stats()['roi_fraction']:.0%} davon nur auf Ausschnitten" if roi is not None else "") + ")")
+    return frame_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Videos headless mit YOLO + DeepSort vorlabeln.")
+    parser.add_argument("--input", default=INPUT_FOLDER, help="Ordner mit den Videos")
+    parser.add_argument("--output", default=OUTPUT_FOLDER, help="Zielordner für die Projektdateien")
+    parser.add_argument("--model", default="yolov8n.pt", help="YOLO-Gewichte")
+    parser.add_argument("--conf", type=float, default=0.5, help="Konfidenz-Schwelle")
+    parser.add_argument("--batch", type=int, default=8, help="Frames pro YOLO-Aufruf")
+    parser.add_argument("--backend", default=DETECTOR_BACKEND, choices=BACKENDS, help="Inferenz-Backend")
+    parser.add_argument("--int8", action="store_true", default=DETECTOR_INT8, help="int8-quantisiertes Modell (onnx/openvino)")
+    parser.add_argument("--threads", type=int, default=DETECTOR_THREADS, help="CPU-Threads für die Inferenz")
+    parser.add_argument("--stride", type=int, default=1, help="YOLO nur alle N Frames (1 = jeder Frame)")
+    parser.add_argument("--motion", type=float, default=MOTION_THRESHOLD, help="Bewegungsschwelle für Zusatz-Detektionen")
+    parser.add_argument("--roi", action="store_true", default=ROI_ENABLED, help="YOLO nur auf Ausschnitten um Tracks")
+    parser.add_argument("--roi-refresh", type=int, default=ROI_REFRESH_INTERVAL, help="Vollbild-Durchlauf alle N Frames")
+    parser.add_argument("--overwrite", action="store_true", help="Bereits gelabelte Videos neu berechnen")
+    args = parser.parse_args()
+
+    videos = find_videos(args.input)
+    if not videos:
+        print(f"ℹ️ Keine Videos in {args.input} gefunden.")
+        return
+
+    detector = YOLOv8Detector(args.model, conf_thresh=args.conf, batch_size=args.batch,
+                              backend=args.backend, threads=args.threads, int8=args.int8, calibration=videos[0])
+    for i, video_path in enumerate(videos, start=1):
+        output_path = project_path_for(video_path, args.output)
+        if os.path.exists(output_path) and not args.overwrite:
+            print(f"ℹ️ [{i}/{len(videos)}] {video_path} bereits gelabelt, übersprungen.")
+            continue
+        print(f"▶️ [{i}/{len(videos)}] {video_path}")
+        roi = RoiDetector(
+            detector, args.roi_refresh, ROI_PADDING, ROI_MIN_SIZE, ROI_MAX_AREA, ROI_ENTRY_ZONES
+        ) if args.roi else None  # pro Video neu, der Refresh-Zähler gehört zum Tracker-Zustand
+        prelabel_video(video_path, output_path, detector, scheduler=DetectionScheduler(args.stride, args.motion), roi=roi)
+
+
+if __name__ == "__main__":
+    main()
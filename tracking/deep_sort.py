@@ -1,21 +1,121 @@
 # tracking/deep_sort.py
 
-from deep_sort_realtime.deepsort_tracker import DeepSort
+import copy
 from typing import List, Tuple
 import numpy as np
 
 class DeepSortTracker:
-    def __init__(self):
+    def __init__(self, checkpoint_interval: int = 30, max_checkpoints: int = 500, replay_source=None):
+        # Import erst hier: deep_sort_realtime zieht torch nach (mehrere Sekunden beim Programmstart)
+        from deep_sort_realtime.deepsort_tracker import DeepSort
         self.tracker = DeepSort(max_age=30)
 
-    def update(self, detections: List[dict], frame: np.ndarray) -> List[dict]:
-        formatted = [
+        # Checkpoints für wahlfreien Zugriff: frame_index -> Tracker-Zustand NACH diesem Frame
+        self.checkpoint_interval = checkpoint_interval
+        self.max_checkpoints = max_checkpoints
+        self.checkpoints = {}
+        self.initial_state = self._snapshot()
+        self.last_frame = None  # zuletzt verarbeiteter Frame-Index
+
+        # replay_source(frame_index) -> (detections, frame) oder None; zum Nachspielen nach einem Seek
+        self.replay_source = replay_source
+
+    def update(self, detections: List[dict], frame: np.ndarray, frame_index: int | None = None) -> List[dict]:
+        # Ohne frame_index: wie bisher, Frames werden als fortlaufend angenommen
+        if frame_index is None:
+            return self._update(detections, frame)
+
+        self.seek(frame_index)
+        output = self._update(detections, frame)
+        self._after_frame(frame_index)
+        return output
+
+    def predict(self, frame: np.ndarray, frame_index: int | None = None) -> List[dict]:
+        """Frame ohne Detektionen: bestätigte Tracks werden per Kalman-Vorhersage fortgeschrieben."""
+        return self.update([], frame, frame_index)
+
+    def predicted_boxes(self, frame_index: int | None = None):
+        """Kalman-Vorhersage aller aktiven Tracks für den nächsten Frame → (xyxy-Array, Anzahl bestätigter).
+
+        (None, 0), wenn frame_index nicht direkt auf den zuletzt verarbeiteten Frame folgt – nach einem
+        Sprung beschreibt der Zustand einen anderen Zeitpunkt.
+        """
+        if frame_index is not None and (self.last_frame is None or frame_index != self.last_frame + 1):
+            return None, 0
+
+        tracks = [t for t in self.tracker.tracker.tracks if not t.is_deleted()]
+        if not tracks:
+            return np.zeros((0, 4), dtype=np.float32), 0
+
+        # Zustand [cx, cy, Seitenverhältnis, h, vx, vy, va, vh] → ein Schritt mit konstanter Geschwindigkeit
+        state = np.array([t.mean[:4] + t.mean[4:8] for t in tracks], dtype=np.float32)
+        h = state[:, 3]
+        w = state[:, 2] * h
+        boxes = np.stack([state[:, 0] - w / 2, state[:, 1] - h / 2, state[:, 0] + w / 2, state[:, 1] + h / 2], axis=1)
+        confirmed = sum(1 for t in tracks if t.is_confirmed())
+        return boxes, confirmed
+
+    def seek(self, frame_index: int):
+        """Bringt den Tracker in den Zustand direkt vor frame_index (Checkpoint + Nachspielen)."""
+        if self.last_frame is not None and frame_index == self.last_frame + 1:
+            return
+
+        base = max((f for f in self.checkpoints if f < frame_index), default=None)
+        if self.last_frame is not None and (base or 0) <= self.last_frame < frame_index:
+            # Sprung nach vorne: vom aktuellen Zustand aus weiterspielen ist billiger
+            start = self.last_frame + 1
+        elif base is not None:
+            self._restore(self.checkpoints[base])
+            start = base + 1
+        else:
+            self._restore(self.initial_state)
+            start = 0
+
+        if self.replay_source is not None:
+            for idx in range(start, frame_index):
+                item = self.replay_source(idx)
+                if item is None:
+                    break
+                detections, frame = item
+                self._update(detections, frame)
+                self._after_frame(idx)
+
+        self.last_frame = frame_index - 1
+
+    def reset(self):
+        self._restore(self.initial_state)
+        self.checkpoints.clear()
+        self.last_frame = None
+
+    def _after_frame(self, frame_index: int):
+        self.last_frame = frame_index
+        if frame_index % self.checkpoint_interval == 0 and frame_index not in self.checkpoints:
+            if len(self.checkpoints) >= self.max_checkpoints:
+                self.checkpoints.pop(next(iter(self.checkpoints)))  # ältesten Checkpoint verwerfen
+            self.checkpoints[frame_index] = self._snapshot()
+
+    def _snapshot(self):
+        # Nur der innere Tracker (Tracks, Kalman-Zustände, Feature-Galerie), nicht der Embedder
+        return copy.deepcopy(self.tracker.tracker)
+
+    def _restore(self, state):
+        self.tracker.tracker = copy.deepcopy(state)
+
+    def _update(self, detections: List[dict], frame: np.ndarray) -> List[dict]:
+        tracks = self.tracker.update_tracks(self.format_detections(detections), frame=frame)
+        return self.format_tracks(tracks)
+
+    @staticmethod
+    def format_detections(detections: List[dict]) -> List[Tuple[list, float, str]]:
+        # DeepSort erwartet ([left, top, w, h], confidence, klasse)
+        return [
             ([x1, y1, x2 - x1, y2 - y1], det["confidence"], det["label"])
             for det in detections
             for (x1, y1, x2, y2) in [det["box"]]
         ]
 
-        tracks = self.tracker.update_tracks(formatted, frame=frame)
+    @staticmethod
+    def format_tracks(tracks) -> List[dict]:
         output = []
 
         for track in tracks:
@@ -28,4 +128,4 @@ class DeepSortTracker:
                 "box": (x1, y1, x2, y2)
             })
 
-        return output
\ No newline at end of file
+        return output
@@ -0,0 +1,96 @@
+# ui/frame_renderer.py - Rendert nur den sichtbaren Ausschnitt eines Frames (mit Zoomstufen-Cache)
+
+import math
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+from PyQt5.QtGui import QPixmap, QImage, QPainter, QColor
+from PyQt5.QtCore import QPoint
+
+
+class FrameRenderer:
+    """Erzeugt die Basis-Pixmap (nur Bild, ohne Boxen) in Viewport-Größe.
+
+    - zoom < 1: der komplett verkleinerte Frame wird pro (Frame, Zoom) gecacht, danach wird nur noch
+      ausgeschnitten – Pan und Mausbewegungen skalieren nichts mehr.
+    - zoom >= 1: erst auf den sichtbaren Bereich zuschneiden, dann nur diesen Ausschnitt skalieren.
+    Die letzte Basis-Pixmap wird wiederverwendet, solange sich Frame, Zoom, Pan und Größe nicht ändern.
+    layer unterscheidet Quellen desselben Frames (z.B. "full" und "proxy") in den Cache-Schlüsseln.
+    """
+
+    def __init__(self, max_levels: int = 8, background=QColor(0, 0, 0)):
+        self.levels = OrderedDict()  # (layer, frame_index, zoom) -> verkleinerter Frame
+        self.max_levels = max_levels
+        self.background = background
+        self.base_key = None
+        self.base_pixmap = None
+
+    def render(self, frame_index: int, frame: np.ndarray, zoom: float, origin_x: float, origin_y: float,
+               view_w: int, view_h: int, layer: str = "full") -> QPixmap:
+        """origin = Position der Bild-Ecke (0, 0) im Viewport; Bildpunkt (x, y) liegt bei origin + (x, y) * zoom."""
+        key = (layer, frame_index, zoom, int(origin_x), int(origin_y), view_w, view_h)
+        if key == self.base_key:
+            return self.base_pixmap
+
+        pixmap = QPixmap(max(view_w, 1), max(view_h, 1))
+        pixmap.fill(self.background)
+
+        crop, dest_x, dest_y = self._visible_part((layer, frame_index), frame, zoom, origin_x, origin_y, view_w, view_h)
+        if crop is not None:
+            crop = np.ascontiguousarray(crop)
+            image = QImage(crop.data, crop.shape[1], crop.shape[0], crop.strides[0], QImage.Format_RGB888)
+            painter = QPainter(pixmap)
+            painter.drawImage(QPoint(dest_x, dest_y), image)
+            painter.end()
+
+        self.base_key = key
+        self.base_pixmap = pixmap
+        return pixmap
+
+    def invalidate(self):
+        self.levels.clear()
+        self.base_key = None
+        self.base_pixmap = None
+
+    def _visible_part(self, frame_key, frame, zoom, origin_x, origin_y, view_w, view_h):
+        h, w = frame.shape[:2]
+
+        if zoom < 1.0:
+            level = self._level(frame_key, frame, zoom)
+            lh, lw = level.shape[:2]
+            x0 = max(int(math.floor(-origin_x)), 0)
+            y0 = max(int(math.floor(-origin_y)), 0)
+            x1 = min(int(math.ceil(view_w - origin_x)), lw)
+            y1 = min(int(math.ceil(view_h - origin_y)), lh)
+            if x1 <= x0 or y1 <= y0:
+                return None, 0, 0
+            return level[y0:y1, x0:x1], int(origin_x) + x0, int(origin_y) + y0
+
+        # Sichtbarer Bereich in Frame-Koordinaten
+        x0 = max(int(math.floor(-origin_x / zoom)), 0)
+        y0 = max(int(math.floor(-origin_y / zoom)), 0)
+        x1 = min(int(math.ceil((view_w - origin_x) / zoom)), w)
+        y1 = min(int(math.ceil((view_h - origin_y) / zoom)), h)
+        if x1 <= x0 or y1 <= y0:
+            return None, 0, 0
+
+        crop = frame[y0:y1, x0:x1]
+        if zoom == 1.0:
+            # 1:1 → direkt aus dem Frame (bzw. dem gemappten Proxy) zeichnen, ohne Resize
+            return crop, int(origin_x + x0), int(origin_y + y0)
+        scaled = cv2.resize(crop, (max(int((x1 - x0) * zoom), 1), max(int((y1 - y0) * zoom), 1)))
+        return scaled, int(origin_x + x0 * zoom), int(origin_y + y0 * zoom)
+
+    def _level(self, frame_key, frame, zoom):
+        key = frame_key + (zoom,)
+        level = self.levels.get(key)
+        if level is None:
+            h, w = frame.shape[:2]
+            level = cv2.resize(frame, (max(int(w * zoom), 1), max(int(h * zoom), 1)), interpolation=cv2.INTER_AREA)
+            self.levels[key] = level
+            if len(self.levels) > self.max_levels:
+                self.levels.popitem(last=False)
+        else:
+            self.levels.move_to_end(key)
+        return level
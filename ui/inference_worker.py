@@ -0,0 +1,79 @@
+# ui/inference_worker.py - Detection + Tracking im Hintergrund, veraltete Anfragen werden verworfen
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class InferenceSignals(QObject):
+    finished = pyqtSignal(int, int, list)  # request_id, frame_index, tracked
+    failed = pyqtSignal(int, int, str)     # request_id, frame_index, Fehlermeldung
+
+
+class InferenceTask(QRunnable):
+    def __init__(self, controller, request_id: int, frame_index: int, frame):
+        super().__init__()
+        self.controller = controller
+        self.request_id = request_id
+        self.frame_index = frame_index
+        self.frame = frame
+        self.signals = InferenceSignals()
+
+    def run(self):
+        # Nutzer ist schon weiter → gar nicht erst rechnen
+        if self.controller.is_stale(self.request_id):
+            return
+        try:
+            tracked = self.controller.infer_fn(self.frame_index, self.frame)
+        except Exception as e:
+            self.signals.failed.emit(self.request_id, self.frame_index, str(e))
+            return
+        self.signals.finished.emit(self.request_id, self.frame_index, tracked)
+
+
+class InferenceController(QObject):
+    """Führt infer_fn(frame_index, frame) auf einem eigenen Worker-Thread aus.
+
+    Es läuft höchstens eine Inferenz gleichzeitig (der Tracker braucht serielle Aufrufe),
+    wartende Anfragen werden bei jeder neuen Anfrage verworfen und nur das Ergebnis
+    der zuletzt gestellten Anfrage wird über result_ready gemeldet.
+    """
+
+    result_ready = pyqtSignal(int, list)  # frame_index, tracked
+    error = pyqtSignal(int, str)          # frame_index, Fehlermeldung
+
+    def __init__(self, infer_fn, parent=None):
+        super().__init__(parent)
+        self.infer_fn = infer_fn
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(1)
+        self.latest_request = 0
+
+    def submit(self, frame_index: int, frame):
+        self.latest_request += 1
+        self.pool.clear()  # noch nicht gestartete Anfragen verwerfen → kein Rückstau beim Scrubben
+
+        task = InferenceTask(self, self.latest_request, frame_index, frame)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+        self.pool.start(task)
+        return self.latest_request
+
+    def cancel(self):
+        self.latest_request += 1
+        self.pool.clear()
+
+    def is_stale(self, request_id: int) -> bool:
+        return request_id != self.latest_request
+
+    def shutdown(self):
+        self.cancel()
+        self.pool.waitForDone(5000)
+
+    def _on_finished(self, request_id, frame_index, tracked):
+        if self.is_stale(request_id):
+            return
+        self.result_ready.emit(frame_index, tracked)
+
+    def _on_failed(self, request_id, frame_index, message):
+        if self.is_stale(request_id):
+            return
+        self.error.emit(frame_index, message)
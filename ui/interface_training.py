@@ -1,24 +1,51 @@
 # ui/interface_training.py
 
+import time
+
+# Ersatz-Referenz für "erster Frame nach N ms", falls der Aufrufer keine started_at übergibt: Import dieses
+# Moduls – Interpreter-Start, PyQt-Import und alles, was der Aufrufer vorher lädt, fehlen dann in der Zahl
+STARTUP_T0 = time.perf_counter()
+
 import sys
 import os
-import cv2
 import numpy as np
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
-    QWidget, QComboBox, QCheckBox, QStatusBar
+    QWidget, QComboBox, QCheckBox, QStatusBar, QSizePolicy, QSpinBox
 )
-from PyQt5.QtGui import QPixmap, QImage, QPainter, QPen, QColor, QKeyEvent
+from PyQt5.QtGui import QPixmap, QPainter, QPen, QColor, QKeyEvent
 from PyQt5.QtCore import Qt, QPoint, QRect
 
-from config import MANUAL_LABEL_OPTIONS
-from labeling.label_manager import LabelManager
+from config import (
+    MANUAL_LABEL_OPTIONS, OUTPUT_FOLDER, FRAME_CACHE_MB, PREFETCH_AHEAD, PREFETCH_BEHIND, DETECTION_CACHE_FOLDER,
+    TRACKER_CHECKPOINT_INTERVAL, VIDEO_INDEX_FOLDER, PROXY_FOLDER, PROXY_MAX_SIDE, DETECTION_STRIDE,
+    MOTION_THRESHOLD, DUPLICATE_FOLDER, DUPLICATE_THRESHOLD, EXPORT_THIN_DUPLICATES, TRACE_FILE, DETECTOR_MODEL,
+    STARTUP_BUDGET_MS, DETECTOR_BACKEND, DETECTOR_INT8, DETECTOR_THREADS, ROI_ENABLED, ROI_REFRESH_INTERVAL,
+    ROI_PADDING, ROI_MIN_SIZE, ROI_MAX_AREA, ROI_ENTRY_ZONES
+)
 from labeling.annotation import Annotation
+from labeling.annotation_store import AnnotationStore
+from labeling.interpolation import INTERPOLATED_SOURCE, regenerate_track
 from detection.yolo8_wrapper import YOLOv8Detector
+from detection.backends import backend_variant
+from detection.detection_cache import DetectionCache
+from detection.scheduler import DetectionScheduler
+from detection.roi_detector import RoiDetector
 from tracking.deep_sort import DeepSortTracker
+from video.frame_source import FrameSource
+from video.video_index import VideoIndex
+from video.proxy_store import ProxyStore
+from video.duplicates import DuplicateIndex
+from ui.inference_worker import InferenceController
+from ui.model_loader import ModelLoader
+from ui.frame_renderer import FrameRenderer
+from utils.tracing import tracer, traced
+from utils.qt_tracing import attach_status_summary
+from export.exporters import CsvExporter, YoloTxtExporter, CocoJsonExporter
 
 class TrainingWindow(QMainWindow):
-    def __init__(self, video_path: str, manager: LabelManager):
+    def __init__(self, video_path: str, manager: AnnotationStore, started_at: float | None = None):
+        # started_at: time.perf_counter() aus der ersten Zeile des Startskripts → Startzeit ab Programmstart
         super().__init__()
 
         self.setWindowTitle("Training Interface")
@@ -26,9 +53,16 @@ class TrainingWindow(QMainWindow):
 
         self.video_path = video_path
         self.manager = manager
-        self.cap = cv2.VideoCapture(video_path)
+        self.video_index = VideoIndex.open(video_path, VIDEO_INDEX_FOLDER)
+        self.frame_source = FrameSource(video_path, FRAME_CACHE_MB, PREFETCH_AHEAD, PREFETCH_BEHIND, self.video_index)
         self.frame_index = 0
-        self.current_frame = None
+        self.current_frame = None  # Vollbild, nur dekodiert wenn nötig
+
+        # Optionaler Proxy (z.B. von ingest.py erzeugt) für Navigation und Übersicht
+        self.proxy = ProxyStore.open(PROXY_FOLDER, self.video_index, PROXY_MAX_SIDE)
+        self.proxy_frame = None
+        # Optionaler Duplikat-Index (ingest.py) → Navigation überspringt Läufe, Detektionen werden geteilt
+        self.duplicates = DuplicateIndex.open(DUPLICATE_FOLDER, self.video_index, DUPLICATE_THRESHOLD)
 
         self.zoom = 1.0
         self.pan_offset = QPoint(0, 0)
@@ -39,21 +73,50 @@ class TrainingWindow(QMainWindow):
         self.box_drawing = False
         self.selected_label = MANUAL_LABEL_OPTIONS[0]
 
-        self.detector = YOLOv8Detector("yolov8n.pt")
-        self.tracker = DeepSortTracker()
+        # Detektor + Tracker (ultralytics/torch, deep_sort_realtime) kommen vom ModelLoader,
+        # bis dahin ist YOLO gesperrt; der Cache braucht nur Modellpfad, Backend-Variante und Roh-Schwelle
+        self.detector = None
+        self.tracker = None
+        self.roi = None  # RoiDetector, falls ROI_ENABLED
+        self.startup_ms = None
+        self.started_at = started_at if started_at is not None else STARTUP_T0
+        self.startup_reference = "Programmstart" if started_at is not None else "Import von ui.interface_training"
+        self.detection_cache = DetectionCache(
+            DETECTION_CACHE_FOLDER, video_path, DETECTOR_MODEL, YOLOv8Detector.DEFAULT_RAW_CONF, self.duplicates,
+            backend_variant(DETECTOR_BACKEND, DETECTOR_INT8)
+        )
+        self.model_loader = ModelLoader(self.build_models, self)
+        self.model_loader.ready.connect(self.on_models_ready)
+        self.model_loader.failed.connect(self.on_models_failed)
+        self.scheduler = DetectionScheduler(DETECTION_STRIDE, MOTION_THRESHOLD)
         self.auto_yolo = True
 
+        # Detection + Tracking laufen im Hintergrund, Ergebnisse kommen per Signal zurück
+        self.inference = InferenceController(self.infer_frame, self)
+        self.inference.result_ready.connect(self.on_inference_result)
+        self.inference.error.connect(self.on_inference_error)
+
         # UI Elemente
         self.video_label = QLabel()
         self.video_label.setMouseTracking(True)
+        # Pixmap hat immer Label-Größe → Label darf frei schrumpfen/wachsen
+        self.video_label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
+        self.renderer = FrameRenderer()
 
         self.next_button = QPushButton("Weiter")
         self.prev_button = QPushButton("Zurück")
         self.save_button = QPushButton("Speichern")
         self.rerun_yolo_button = QPushButton("YOLO neu ausführen")
         self.label_dropdown = QComboBox()
+        # Manuelle Boxen mit gleichem Label + Track sind Keyframes, dazwischen wird interpoliert
+        self.track_spinbox = QSpinBox()
+        self.track_spinbox.setRange(0, 9999)
+        self.track_spinbox.setPrefix("Track ")
+        self.track_spinbox.setSpecialValueText("Kein Track")
         self.yolo_checkbox = QCheckBox("YOLO Auto")
         self.yolo_checkbox.setChecked(True)
+        self.skip_duplicates_checkbox = QCheckBox("Duplikate überspringen")
+        self.skip_duplicates_checkbox.setEnabled(self.duplicates is not None)
 
         for label in MANUAL_LABEL_OPTIONS:
             self.label_dropdown.addItem(label)
@@ -64,7 +127,9 @@ class TrainingWindow(QMainWindow):
         button_layout.addWidget(self.save_button)
         button_layout.addWidget(self.rerun_yolo_button)
         button_layout.addWidget(self.label_dropdown)
+        button_layout.addWidget(self.track_spinbox)
         button_layout.addWidget(self.yolo_checkbox)
+        button_layout.addWidget(self.skip_duplicates_checkbox)
 
         main_layout = QVBoxLayout()
         main_layout.addWidget(self.video_label)
@@ -85,8 +150,34 @@ class TrainingWindow(QMainWindow):
         self.yolo_checkbox.stateChanged.connect(self.toggle_yolo_auto)
 
         self.video_label.installEventFilter(self)
+        self.trace_timer = attach_status_summary(self, ["load_frame", "decode", "show_frame", "run_yolo", "detect", "track"])
         self.show()
         self.load_frame()
+        self.model_loader.start()  # erst nach dem ersten Frame, damit er nicht um die CPU konkurriert
+
+    def build_models(self):
+        """Läuft im Loader-Thread: schwere Imports, Gewichte laden, ein Warm-up-Durchlauf."""
+        detector = YOLOv8Detector(DETECTOR_MODEL, backend=DETECTOR_BACKEND, threads=DETECTOR_THREADS, int8=DETECTOR_INT8,
+                                  calibration=self.video_path)
+        detector.detect_raw(np.zeros((self.video_index.height, self.video_index.width, 3), dtype=np.uint8))
+        tracker = DeepSortTracker(TRACKER_CHECKPOINT_INTERVAL, replay_source=self.tracker_replay_source)
+        roi = RoiDetector(
+            detector, ROI_REFRESH_INTERVAL, ROI_PADDING, ROI_MIN_SIZE, ROI_MAX_AREA, ROI_ENTRY_ZONES
+        ) if ROI_ENABLED else None
+        return detector, tracker, roi
+
+    def on_models_ready(self, models):
+        self.detector, self.tracker, self.roi = models
+        print(f"✅ Modelle geladen nach {self.model_loader.seconds:.1f} s")
+        if self.auto_yolo:
+            self.run_yolo()
+
+    def on_models_failed(self, message):
+        print(f"❌ Modelle konnten nicht geladen werden: {message}")
+        self.statusBar().showMessage("YOLO nicht verfügbar")
+
+    def models_ready(self):
+        return self.detector is not None and self.tracker is not None
 
     def toggle_yolo_auto(self, state):
         self.auto_yolo = state == Qt.Checked
@@ -95,68 +186,146 @@ class TrainingWindow(QMainWindow):
         """Aktualisiert das aktuell ausgewählte Label im Dropdown-Menü."""
         self.selected_label = self.label_dropdown.currentText()
 
+    @traced("load_frame")
     def load_frame(self):
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, self.frame_index)
-        success, frame = self.cap.read()
-        if not success:
-            print(f"❌ Frame {self.frame_index} konnte nicht geladen werden.")
-            return
-
-        self.current_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        self.zoom = self.calculate_default_zoom()
+        proxy_frame = self.proxy.frame(self.frame_index) if self.proxy is not None else None
+        zoom = self.calculate_default_zoom()
+
+        frame = None
+        if proxy_frame is None or not self.proxy.covers(zoom):
+            with tracer.span("decode", frame=self.frame_index):
+                frame = self.frame_source.get_frame(self.frame_index)
+            if frame is None:
+                print(f"❌ Frame {self.frame_index} konnte nicht geladen werden.")
+                return
+
+        self.current_frame = frame
+        self.proxy_frame = proxy_frame
+        self.zoom = zoom
         self.pan_offset = QPoint(0, 0)
 
+        # Frame sofort anzeigen, Boxen werden nachgezeichnet sobald YOLO fertig ist
+        self.show_frame()
         if self.auto_yolo:
             self.run_yolo()
-        self.show_frame()
+        else:
+            self.inference.cancel()
 
     def calculate_default_zoom(self):
         window_width = self.video_label.width() if self.video_label.width() > 0 else 1200
-        frame_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        frame_width = self.video_index.width
         return min((window_width * 0.9) / frame_width, 1.0)
 
     def run_yolo(self):
-        detections = self.detector.detect(self.current_frame)
-        tracked = self.tracker.update(detections, self.current_frame)
-        for t in tracked:
-            ann = Annotation(
+        if not self.models_ready():
+            # on_models_ready holt den aktuellen Frame nach
+            self.statusBar().showMessage("YOLO wird noch geladen ...")
+            return
+        self.inference.submit(self.frame_index, self.current_frame)
+        self.statusBar().showMessage(f"YOLO läuft für Frame {self.frame_index} ...")
+
+    @traced("run_yolo")
+    def infer_frame(self, frame_index, frame):
+        """Läuft im Worker-Thread – hier keine Qt-Widgets anfassen."""
+        if frame is None:
+            # Anzeige kam aus dem Proxy → Vollbild erst hier (im Hintergrund) dekodieren
+            with tracer.span("decode", frame=frame_index):
+                frame = self.frame_source.get_frame(frame_index)
+            if frame is None:
+                raise IOError(f"Frame {frame_index} konnte nicht dekodiert werden")
+        if not self.scheduler.should_detect(frame_index, frame):
+            with tracer.span("track", frame=frame_index):
+                return self.tracker.predict(frame, frame_index)
+        with tracer.span("detect", frame=frame_index):
+            if self.roi is not None:
+                # Nur Ausschnitte um die vorhergesagten Tracks; Vollbild (über den Cache) nach Sprüngen/Refresh
+                predicted, confirmed = self.tracker.predicted_boxes(frame_index)
+                raw = self.roi.detect_raw(frame_index, frame, predicted, confirmed, self.detection_cache)
+            else:
+                raw = self.detection_cache.detect(self.detector, frame_index, frame)
+            detections = self.detector.filter_raw(raw)
+        with tracer.span("track", frame=frame_index):
+            return self.tracker.update(detections, frame, frame_index)
+
+    def tracker_replay_source(self, frame_index):
+        """Liefert (detections, frame) zum Nachspielen nach einem Sprung; läuft im Worker-Thread."""
+        frame = self.frame_source.get_frame(frame_index, prefetch=False)
+        if frame is None:
+            return None
+        if not self.scheduler.should_detect(frame_index, frame, replay=True):
+            return [], frame
+        if self.roi is not None:
+            # Gespeicherte Ausschnitt-Ergebnisse statt Vollbild, sonst entsteht ein anderer Trackerzustand
+            raw = self.roi.replay_raw(frame_index, frame, self.detection_cache)
+        else:
+            raw = self.detection_cache.detect(self.detector, frame_index, frame)
+        return self.detector.filter_raw(raw), frame
+
+    def on_inference_result(self, frame_index, tracked):
+        # Ersetzt vorhandene YOLO-Boxen des Frames (z.B. bei erneutem Besuch oder Rerun)
+        self.manager.replace_frame(frame_index, "yolo", [
+            Annotation(
                 video_id=1,
-                frame=self.frame_index,
+                frame=frame_index,
                 label=t["label"],
                 box=t["box"],
                 source="yolo",
                 track_id=t["track_id"]
             )
-            self.manager.add_annotation(ann)
+            for t in tracked
+        ])
+
+        fraction = self.scheduler.inferred_fraction
+        self.statusBar().showMessage(f"YOLO: {len(tracked)} Boxen in Frame {frame_index} (Detektion auf {fraction:.0%} der Frames)")
+        if frame_index == self.frame_index:
+            self.show_frame()
+
+    def on_inference_error(self, frame_index, message):
+        print(f"❌ YOLO für Frame {frame_index} fehlgeschlagen: {message}")
 
     def manual_rerun_yolo(self):
-        self.manager.annotations = [a for a in self.manager.annotations if not (a.frame == self.frame_index and a.source == "yolo")]
         self.run_yolo()
-        self.show_frame()
 
-    def show_frame(self):
+    def has_frame(self):
+        return getattr(self, "current_frame", None) is not None or getattr(self, "proxy_frame", None) is not None
+
+    def display_image(self):
+        """(Bild, Skalierung, Layer) für den aktuellen Zoom – Vollbild erst, wenn der Proxy nicht mehr reicht."""
+        if self.proxy_frame is not None and self.proxy.covers(self.zoom):
+            return self.proxy_frame, self.proxy.scale, "proxy"
         if self.current_frame is None:
-            return
+            with tracer.span("decode", frame=self.frame_index):
+                self.current_frame = self.frame_source.get_frame(self.frame_index)
+        if self.current_frame is None:
+            return self.proxy_frame, self.proxy.scale, "proxy"
+        return self.current_frame, 1.0, "full"
 
-        frame = self.current_frame.copy()
-        h, w = frame.shape[:2]
-        scaled_w = int(w * self.zoom)
-        scaled_h = int(h * self.zoom)
-        frame_resized = cv2.resize(frame, (scaled_w, scaled_h))
+    @traced("show_frame")
+    def show_frame(self):
+        if not self.has_frame():
+            return
 
-        image = QImage(frame_resized.data, frame_resized.shape[1], frame_resized.shape[0], frame_resized.strides[0], QImage.Format_RGB888)
-        pixmap = QPixmap.fromImage(image)
+        # Nur der sichtbare Ausschnitt wird skaliert; die Basis-Pixmap bleibt gecacht,
+        # solange sich Frame, Zoom und Pan nicht ändern (z.B. beim Box-Aufziehen)
+        origin_x, origin_y = self.image_origin()
+        image, scale, layer = self.display_image()
+        base = self.renderer.render(
+            self.frame_index, image, self.zoom / scale, origin_x, origin_y,
+            self.video_label.width(), self.video_label.height(), layer
+        )
+        pixmap = QPixmap(base)
 
         painter = QPainter(pixmap)
         pen = QPen(QColor(0, 255, 0), 2)
-        painter.setPen(pen)
+        interpolated_pen = QPen(QColor(255, 200, 0), 1, Qt.DashLine)
 
         for ann in self.manager.get_by_frame(self.frame_index):
+            painter.setPen(interpolated_pen if ann.source == INTERPOLATED_SOURCE else pen)
             x1, y1, x2, y2 = ann.box
-            x1 = int(x1 * self.zoom + self.pan_offset.x())
-            y1 = int(y1 * self.zoom + self.pan_offset.y())
-            x2 = int(x2 * self.zoom + self.pan_offset.x())
-            y2 = int(y2 * self.zoom + self.pan_offset.y())
+            x1 = int(x1 * self.zoom + origin_x)
+            y1 = int(y1 * self.zoom + origin_y)
+            x2 = int(x2 * self.zoom + origin_x)
+            y2 = int(y2 * self.zoom + origin_y)
             painter.drawRect(QRect(QPoint(x1, y1), QPoint(x2, y2)))
             painter.drawText(x1, y1 - 5, ann.label)
 
@@ -167,26 +336,37 @@ class TrainingWindow(QMainWindow):
         painter.end()
         self.video_label.setPixmap(pixmap)
 
-    def mapToImageCoordinates(self, pos):
+        if self.startup_ms is None:
+            self.startup_ms = (time.perf_counter() - self.started_at) * 1000
+            marker = "✅" if self.startup_ms <= STARTUP_BUDGET_MS else "❌"
+            print(f"{marker} Erster Frame {self.startup_ms:.0f} ms nach {self.startup_reference} "
+                  f"(Budget {STARTUP_BUDGET_MS} ms)")
+
+    def image_origin(self):
+        """Position der Bild-Ecke (0, 0) im Video-Label: zentriert plus Pan."""
         label_size = self.video_label.size()
-        frame_h, frame_w = self.current_frame.shape[:2]
+        frame_w, frame_h = self.video_index.width, self.video_index.height
         scaled_w = frame_w * self.zoom
         scaled_h = frame_h * self.zoom
 
         offset_x = max((label_size.width() - scaled_w) / 2, 0)
         offset_y = max((label_size.height() - scaled_h) / 2, 0)
+        return offset_x + self.pan_offset.x(), offset_y + self.pan_offset.y()
+
+    def mapToImageCoordinates(self, pos):
+        origin_x, origin_y = self.image_origin()
 
-        x = (pos.x() - offset_x - self.pan_offset.x()) / self.zoom
-        y = (pos.y() - offset_y - self.pan_offset.y()) / self.zoom
+        x = (pos.x() - origin_x) / self.zoom
+        y = (pos.y() - origin_y) / self.zoom
 
         return int(x), int(y)
 
     def updateMousePositionDisplay(self, pos):
-        if self.current_frame is None:
+        if not self.has_frame():
             self.statusBar().showMessage("")
             return
         x, y = self.mapToImageCoordinates(pos)
-        frame_h, frame_w = self.current_frame.shape[:2]
+        frame_w, frame_h = self.video_index.width, self.video_index.height
         if 0 <= x < frame_w and 0 <= y < frame_h:
             self.statusBar().showMessage(f"X: {x}  Y: {y}")
         else:
@@ -207,6 +387,11 @@ class TrainingWindow(QMainWindow):
         )
         self.show_frame()
 
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.has_frame():
+            self.show_frame()
+
     def keyPressEvent(self, event: QKeyEvent):
         if event.key() == Qt.Key_Comma:
             self.prev_frame()
@@ -248,30 +433,65 @@ class TrainingWindow(QMainWindow):
                 frame=self.frame_index,
                 label=self.selected_label,
                 box=(x1, y1, x2, y2),
-                source="manual"
+                source="manual",
+                track_id=self.track_spinbox.value() or None
             )
             self.manager.add_annotation(ann)
+            if ann.track_id is not None:
+                count = regenerate_track(self.manager, ann.video_id, ann.label, ann.track_id)
+                self.statusBar().showMessage(f"{count} Boxen für {ann.label} #{ann.track_id} interpoliert")
             self.box_drawing = False
             self.start_point = None
             self.end_point = None
             self.show_frame()
 
+    def skipping_duplicates(self):
+        return self.duplicates is not None and self.skip_duplicates_checkbox.isChecked()
+
     def next_frame(self):
-        self.frame_index += 1
+        last = self.video_index.frame_count - 1
+        if self.video_index.frame_count and self.frame_index >= last:
+            return
+        if self.skipping_duplicates():
+            self.frame_index = min(self.duplicates.next_distinct(self.frame_index), max(last, 0))
+        else:
+            self.frame_index += 1
         self.load_frame()
 
     def prev_frame(self):
-        self.frame_index = max(0, self.frame_index - 1)
+        if self.skipping_duplicates():
+            self.frame_index = self.duplicates.prev_distinct(self.frame_index)
+        else:
+            self.frame_index = max(0, self.frame_index - 1)
         self.load_frame()
 
     def save_frame(self):
-        import pandas as pd
-        if not os.path.exists("data/output"):
-            os.makedirs("data/output")
-        df = pd.DataFrame(self.manager.export_as_dicts())
-        df.to_csv("data/output/manual_labels.csv", index=False)
-        print(f"✅ Labels gespeichert unter data/output/manual_labels.csv")
+        # Streamt Frame für Frame; bei erneutem Speichern werden nur geänderte Frames neu geschrieben
+        image_size = (self.video_index.width, self.video_index.height)
+        csv_path = os.path.join(OUTPUT_FOLDER, "manual_labels.csv")
+        frames = None
+        if EXPORT_THIN_DUPLICATES and self.duplicates is not None:
+            frames = self.duplicates.thin(self.manager.frames())  # pro Duplikat-Lauf nur ein Frame
+        stats = CsvExporter(csv_path).export(self.manager, frames)
+        YoloTxtExporter(os.path.join(OUTPUT_FOLDER, "yolo"), image_size, MANUAL_LABEL_OPTIONS).export(self.manager, frames)
+        CocoJsonExporter(os.path.join(OUTPUT_FOLDER, "coco.json"), image_size, MANUAL_LABEL_OPTIONS).export(self.manager, frames)
+        print(f"✅ Labels gespeichert unter {OUTPUT_FOLDER} ({stats['written']} von {stats['frames']} Frames neu geschrieben)")
 
     def closeEvent(self, event):
-        self.cap.release()
+        self.inference.shutdown()
+        stats = self.frame_source.stats()
+        print(f"ℹ️ Frame-Cache: {stats['hits']} Hits, {stats['misses']} Misses ({stats['hit_rate']:.0%})")
+        scheduler_stats = self.scheduler.stats()
+        print(f"ℹ️ YOLO lief auf {scheduler_stats['inferred']} von {scheduler_stats['frames']} Frames ({scheduler_stats['inferred_fraction']:.0%})")
+        if self.roi is not None:
+            roi_stats = self.roi.stats()
+            print(f"ℹ️ ROI-Detektion: {roi_stats['roi_passes']} Ausschnitt-, {roi_stats['full_passes']} Vollbild-Durchläufe "
+                  f"(Ø {roi_stats['roi_area']:.0%} des Bildes)")
+        self.frame_source.close()
+        self.detection_cache.close()
+        if self.proxy is not None:
+            self.proxy.close()
+        if tracer.enabled:
+            count = tracer.dump(TRACE_FILE)
+            print(f"ℹ️ Trace mit {count} Spans gespeichert unter {TRACE_FILE}")
         super().closeEvent(event)
\ No newline at end of file
@@ -0,0 +1,37 @@
+# ui/model_loader.py - Baut Detektor/Tracker auf einem Hintergrund-Thread, damit das Fenster sofort erscheint
+
+import threading
+import time
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class ModelLoader(QObject):
+    """Führt factory() (Imports + Modell laden + Warm-up) außerhalb des GUI-Threads aus.
+
+    ready/failed werden aus dem Worker-Thread emittiert; Qt stellt sie per Queued Connection
+    im GUI-Thread zu.
+    """
+
+    ready = pyqtSignal(object)  # Rückgabewert von factory()
+    failed = pyqtSignal(str)    # Fehlermeldung
+
+    def __init__(self, factory, parent=None):
+        super().__init__(parent)
+        self.factory = factory
+        self.thread = threading.Thread(target=self._run, name="model-loader", daemon=True)
+        self.started_at = None
+        self.seconds = None  # Ladedauer, sobald fertig
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self.thread.start()
+
+    def _run(self):
+        try:
+            result = self.factory()
+        except Exception as e:
+            self.failed.emit(f"{type(e).__name__}: {e}")
+            return
+        self.seconds = time.perf_counter() - self.started_at
+        self.ready.emit(result)
@@ -0,0 +1,19 @@
+# utils/qt_tracing.py - Anzeige der Tracing-Statistik in der Statusleiste (Tracer selbst, Qt-frei: utils/tracing.py)
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QLabel
+
+from utils.tracing import tracer
+
+
+def attach_status_summary(window, names, interval_ms: int = 1000):
+    """Zeigt die Rolling-Statistik als festes Feld in der Statusleiste von window (nur bei aktivem Tracing)."""
+    if not tracer.enabled:
+        return None
+
+    label = QLabel()
+    window.statusBar().addPermanentWidget(label)
+    timer = QTimer(window)
+    timer.timeout.connect(lambda: label.setText(tracer.summary(names)))
+    timer.start(interval_ms)
+    return timer
@@ -0,0 +1,144 @@
+# utils/tracing.py - Zeitmessung der heißen Pfade: Spans, Rolling-Statistik, Chrome-Trace-Export (ohne Qt)
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from config import TRACE_ENABLED, TRACE_WINDOW, TRACE_MAX_EVENTS
+
+
+class _NullSpan:
+    """Wird bei ausgeschaltetem Tracing zurückgegeben – kein Zeitstempel, keine Allokation."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, self.start, time.perf_counter(), self.args)
+        return False
+
+
+class Tracer:
+    """Sammelt Spans (Name, Start, Dauer, Thread) pro Stufe.
+
+    - stats: die letzten window Dauern je Stufe → Median/p95 für die Statusleiste
+    - events: Ringpuffer im Chrome-Trace-Format (chrome://tracing, ui.perfetto.dev)
+    """
+
+    def __init__(self, enabled: bool = False, window: int = 100, max_events: int = 200_000):
+        self.enabled = enabled
+        self.window = window
+        self.stats = {}  # name -> deque[ms]
+        self.events = deque(maxlen=max_events)
+        self.origin = time.perf_counter()
+        self.lock = threading.Lock()
+
+    def span(self, name: str, **args):
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name, args)
+
+    def record(self, name: str, start: float, end: float, args=None):
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": (start - self.origin) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        with self.lock:
+            self.events.append(event)
+            durations = self.stats.get(name)
+            if durations is None:
+                durations = self.stats[name] = deque(maxlen=self.window)
+            durations.append((end - start) * 1000)
+
+    def percentiles(self, name: str):
+        """(Median, p95) in ms über das Fenster, None ohne Messwerte."""
+        with self.lock:
+            durations = sorted(self.stats.get(name, ()))
+        if not durations:
+            return None
+        return durations[len(durations) // 2], durations[min(int(len(durations) * 0.95), len(durations) - 1)]
+
+    def summary(self, names=None) -> str:
+        parts = []
+        for name in names or sorted(self.stats):
+            values = self.percentiles(name)
+            if values is not None:
+                parts.append(f"{name} {values[0]:.1f}/{values[1]:.1f}")
+        return ("ms (p50/p95): " + " | ".join(parts)) if parts else ""
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        with self.lock:
+            self.stats.clear()
+            self.events.clear()
+
+    def dump(self, path: str) -> int:
+        """Schreibt alle gepufferten Spans als Chrome-Trace-JSON; liefert die Anzahl Events."""
+        with self.lock:
+            events = list(self.events)
+        thread_names = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": t.ident, "args": {"name": t.name}}
+            for t in threading.enumerate()
+        ]
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"traceEvents": thread_names + events, "displayTimeUnit": "ms"}, f)
+        os.replace(tmp_path, path)
+        return len(events)
+
+
+# Prozessweiter Tracer; LABEL_HELPER_TRACE=1 schaltet ihn ohne Config-Änderung ein
+tracer = Tracer(
+    enabled=TRACE_ENABLED or os.environ.get("LABEL_HELPER_TRACE") == "1",
+    window=TRACE_WINDOW,
+    max_events=TRACE_MAX_EVENTS,
+)
+
+
+def traced(name: str):
+    """Decorator: ganze Methode als Span messen; ausgeschaltet bleibt nur ein Attribut-Check."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return fn(*args, **kwargs)
+            with _Span(tracer, name, None):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,160 @@
+# video/duplicates.py - Läufe nahezu identischer Frames finden (statische Kameras) und als Index cachen
+
+import hashlib
+import os
+
+import cv2
+import numpy as np
+
+DUPLICATE_VERSION = 1
+
+
+def iter_thumbnails(video_path: str, proxy=None, width: int = 64, chunk: int = 512):
+    """Graue Mini-Bilder (uint8, Breite width) aller Frames in Blöcken von chunk Frames.
+
+    Mit Proxy wird aus dem gemappten Array gelesen statt das Video erneut zu dekodieren.
+    """
+    if proxy is not None:
+        height = max(int(proxy.height * width / proxy.width), 1)
+        for start in range(0, proxy.frame_count, chunk):
+            frames = proxy.frames[start:start + chunk]
+            yield np.stack([
+                cv2.cvtColor(cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA), cv2.COLOR_RGB2GRAY)
+                for frame in frames
+            ])
+        return
+
+    cap = cv2.VideoCapture(video_path)
+    height = None
+    block = []
+    while True:
+        success, frame = cap.read()
+        if not success:
+            break
+        if height is None:
+            height = max(int(frame.shape[0] * width / frame.shape[1]), 1)
+        small = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+        block.append(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY))
+        if len(block) == chunk:
+            yield np.stack(block)
+            block = []
+    cap.release()
+    if block:
+        yield np.stack(block)
+
+
+def find_run_starts(thumbnail_chunks, threshold: float = 0.04):
+    """(Start-Frames der Duplikat-Läufe, Anzahl Frames).
+
+    Ein Frame gehört zum laufenden Lauf, solange kein Mini-Pixel um mehr als threshold (0..1) vom
+    ersten Frame des Laufs abweicht – Vergleich mit dem Laufanfang statt nur mit dem Vorgänger,
+    damit langsame Änderungen nicht endlos in einen Lauf hineinwandern.
+    """
+    limit = threshold * 255
+    starts = []
+    start_thumb = None
+    offset = 0
+
+    for thumbs in thumbnail_chunks:
+        thumbs = thumbs.astype(np.int16)
+        pos = 0
+        while pos < len(thumbs):
+            if start_thumb is None:
+                starts.append(offset + pos)
+                start_thumb = thumbs[pos]
+                pos += 1
+                continue
+            # Abweichung aller restlichen Frames des Blocks zum Laufanfang in einem Schritt
+            distance = np.abs(thumbs[pos:] - start_thumb).max(axis=(1, 2))
+            breaks = np.flatnonzero(distance > limit)
+            if len(breaks) == 0:
+                break
+            pos += int(breaks[0])
+            start_thumb = None  # nächster Schleifendurchlauf startet dort einen neuen Lauf
+        offset += len(thumbs)
+
+    return np.asarray(starts, dtype=np.int64), offset
+
+
+class DuplicateIndex:
+    """Duplikat-Läufe eines Videos: run_starts[i] ist der erste (repräsentative) Frame von Lauf i."""
+
+    def __init__(self, run_starts, frame_count: int):
+        self.run_starts = np.asarray(run_starts, dtype=np.int64)
+        self.frame_count = frame_count
+
+    @classmethod
+    def build(cls, video_path: str, proxy=None, threshold: float = 0.04) -> "DuplicateIndex":
+        run_starts, frame_count = find_run_starts(iter_thumbnails(video_path, proxy), threshold)
+        return cls(run_starts, frame_count)
+
+    @classmethod
+    def open(cls, cache_dir: str, index, threshold: float, video_path: str | None = None, proxy=None):
+        """Aus dem Cache laden; mit video_path wird ein fehlender Index gebaut und gespeichert, sonst None."""
+        path = os.path.join(cache_dir, f"{index.fingerprint}_{threshold:g}.npz")
+        if os.path.exists(path):
+            data = np.load(path)
+            if int(data["version"]) == DUPLICATE_VERSION:
+                return cls(data["run_starts"], int(data["frame_count"]))
+        if video_path is None:
+            return None
+
+        duplicates = cls.build(video_path, proxy, threshold)
+        duplicates.save(path)
+        return duplicates
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, version=DUPLICATE_VERSION, run_starts=self.run_starts, frame_count=self.frame_count)
+        os.replace(tmp_path, path)
+
+    def run_of(self, frame_index: int) -> int:
+        return max(int(np.searchsorted(self.run_starts, frame_index, side="right")) - 1, 0)
+
+    def representative(self, frame_index: int) -> int:
+        """Erster Frame des Laufs; Frames außerhalb des Index stehen für sich selbst."""
+        if not 0 <= frame_index < self.frame_count or len(self.run_starts) == 0:
+            return frame_index
+        return int(self.run_starts[self.run_of(frame_index)])
+
+    def is_duplicate(self, frame_index: int) -> bool:
+        return self.representative(frame_index) != frame_index
+
+    def next_distinct(self, frame_index: int) -> int:
+        """Erster Frame des nächsten Laufs (bzw. frame_index + 1 außerhalb des Index)."""
+        run = self.run_of(frame_index) + 1
+        if not 0 <= frame_index < self.frame_count or run >= len(self.run_starts):
+            return frame_index + 1
+        return int(self.run_starts[run])
+
+    def prev_distinct(self, frame_index: int) -> int:
+        """Erster Frame des vorherigen Laufs bzw. Anfang des aktuellen, wenn man mitten drin steht."""
+        if not 0 < frame_index < self.frame_count or len(self.run_starts) == 0:
+            return max(frame_index - 1, 0)
+        run = self.run_of(frame_index)
+        if self.run_starts[run] < frame_index:
+            return int(self.run_starts[run])
+        return int(self.run_starts[max(run - 1, 0)])
+
+    def thin(self, frames) -> list:
+        """Aus frames pro Lauf nur den ersten behalten (z.B. für ausgedünnte Exporte)."""
+        frames = np.unique(np.asarray(list(frames), dtype=np.int64))
+        if len(frames) == 0 or len(self.run_starts) == 0:
+            return frames.tolist()
+        inside = (frames >= 0) & (frames < self.frame_count)
+        runs = np.searchsorted(self.run_starts, frames[inside], side="right") - 1
+        _, first = np.unique(runs, return_index=True)
+        # Frames außerhalb des Index bleiben einzeln erhalten
+        return np.sort(np.concatenate([frames[inside][first], frames[~inside]])).tolist()
+
+    @property
+    def distinct_count(self) -> int:
+        return len(self.run_starts)
+
+    @property
+    def fingerprint(self) -> str:
+        """Kurzer Hash der Lauf-Grenzen – ändert sich mit Schwelle oder Erkennung."""
+        digest = hashlib.sha1(np.ascontiguousarray(self.run_starts, dtype=np.int64).tobytes())
+        digest.update(str(self.frame_count).encode())
+        return digest.hexdigest()[:12]
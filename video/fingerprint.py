@@ -0,0 +1,23 @@
+# video/fingerprint.py - Schneller Inhalts-Hash für große Dateien (Videos, Modellgewichte)
+
+import hashlib
+import os
+
+
+def file_fingerprint(path: str, sample_bytes: int = 1024 * 1024) -> str:
+    """Hash über Dateigröße plus Anfang, Mitte und Ende der Datei.
+
+    Liest höchstens 3 * sample_bytes, statt mehrere GB Video komplett zu hashen.
+    """
+    size = os.path.getsize(path)
+    digest = hashlib.sha1(str(size).encode())
+
+    with open(path, "rb") as f:
+        if size <= 3 * sample_bytes:
+            digest.update(f.read())
+        else:
+            for offset in (0, size // 2, size - sample_bytes):
+                f.seek(offset)
+                digest.update(f.read(sample_bytes))
+
+    return digest.hexdigest()[:16]
@@ -0,0 +1,206 @@
+# video/frame_source.py - Frame-Quelle mit Hintergrund-Prefetch und LRU-Cache
+
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+from video.video_index import VideoIndex
+
+
+class FrameCache:
+    """LRU-Cache für dekodierte Frames, begrenzt über den Speicherbedarf in Bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.frames = OrderedDict()  # frame_index -> np.ndarray (RGB)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, frame_index: int):
+        with self.lock:
+            frame = self.frames.get(frame_index)
+            if frame is None:
+                self.misses += 1
+                return None
+            self.frames.move_to_end(frame_index)
+            self.hits += 1
+            return frame
+
+    def contains(self, frame_index: int) -> bool:
+        # Zählt bewusst nicht als Hit/Miss (wird vom Prefetch benutzt)
+        with self.lock:
+            return frame_index in self.frames
+
+    def put(self, frame_index: int, frame: np.ndarray):
+        with self.lock:
+            old = self.frames.pop(frame_index, None)
+            if old is not None:
+                self.current_bytes -= old.nbytes
+            if frame.nbytes > self.max_bytes:
+                return
+
+            self.frames[frame_index] = frame
+            self.current_bytes += frame.nbytes
+
+            # Älteste Frames verwerfen, bis das Limit wieder passt
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self.frames.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+
+    def clear(self):
+        with self.lock:
+            self.frames.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> dict:
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "frames": len(self.frames),
+                "bytes": self.current_bytes,
+            }
+
+
+class SequentialReader:
+    """Liest Frames über eine eigene VideoCapture und vermeidet Seeks bei fortlaufendem Zugriff.
+
+    Mit VideoIndex wird nur auf Keyframes gesprungen und von dort vorwärts dekodiert – das ist auch
+    bei Codecs frame-genau, deren CAP_PROP_POS_FRAMES-Seek daneben liegt.
+    """
+
+    def __init__(self, video_path: str, max_skip: int = 8, index=None):
+        self.cap = cv2.VideoCapture(video_path)
+        self.next_index = 0
+        self.max_skip = max_skip  # kleine Sprünge nach vorne per grab() statt Seek
+        self.index = index
+
+    def read(self, frame_index: int):
+        gap = frame_index - self.next_index
+        if gap != 0 and not self._can_decode_forward(frame_index, gap):
+            start = self.index.keyframe_before(frame_index) if self.index is not None else frame_index
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+            gap = frame_index - start
+        for _ in range(gap if gap > 0 else 0):
+            self.cap.grab()
+
+        success, frame = self.cap.read()
+        if not success:
+            self.next_index = -1  # Position unbekannt → nächster Zugriff seekt
+            return None
+
+        self.next_index = frame_index + 1
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+    def _can_decode_forward(self, frame_index: int, gap: int) -> bool:
+        if gap <= 0 or self.next_index < 0:
+            return False
+        if gap <= self.max_skip:
+            return True
+        # Liegt kein Keyframe zwischen Position und Ziel, wäre ein Seek nicht schneller
+        return self.index is not None and self.index.keyframe_before(frame_index) < self.next_index
+
+    def release(self):
+        self.cap.release()
+
+
+class FrameSource:
+    """Liefert RGB-Frames eines Videos; dekodiert im Hintergrund um den aktuellen Index herum vor."""
+
+    def __init__(self, video_path: str, cache_mb: int = 512, prefetch_ahead: int = 16, prefetch_behind: int = 4,
+                 index: VideoIndex | None = None):
+        self.video_path = video_path
+        self.index = index if index is not None else VideoIndex.build(video_path)
+        self.cache = FrameCache(cache_mb * 1024 * 1024)
+        self.prefetch_ahead = prefetch_ahead
+        self.prefetch_behind = prefetch_behind
+
+        # Synchroner Leser für Cache-Misses (GUI-Thread)
+        self.reader = SequentialReader(video_path, index=self.index)
+        self.reader_lock = threading.Lock()
+
+        self.width = self.index.width
+        self.height = self.index.height
+        self.frame_count = self.index.frame_count
+        self.fps = self.index.fps
+
+        self._target = None
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._worker = threading.Thread(target=self._prefetch_loop, daemon=True)
+        self._worker.start()
+
+    def get_frame(self, frame_index: int, prefetch: bool = True):
+        frame = self.cache.get(frame_index)
+        if frame is None:
+            with self.reader_lock:
+                frame = self.reader.read(frame_index)
+            if frame is not None:
+                self.cache.put(frame_index, frame)
+
+        if prefetch:
+            self.request_prefetch(frame_index)
+        return frame
+
+    def request_prefetch(self, frame_index: int):
+        with self._condition:
+            self._target = frame_index
+            self._condition.notify()
+
+    def stats(self) -> dict:
+        return self.cache.stats()
+
+    def close(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._worker.join(timeout=2.0)
+        with self.reader_lock:
+            self.reader.release()
+
+    def _prefetch_indices(self, center: int):
+        # Nicht mehr vorausladen als in den Cache passt, sonst verdrängt der Prefetch den aktuellen Frame
+        frame_bytes = max(self.width * self.height * 3, 1)
+        capacity = max(self.cache.max_bytes // frame_bytes - 1, 0)
+        ahead = min(self.prefetch_ahead, capacity)
+        behind = min(self.prefetch_behind, capacity - ahead)
+
+        last = center + ahead
+        if self.frame_count > 0:
+            last = min(last, self.frame_count - 1)
+
+        # Vorwärts zuerst (sequentiell, billig), danach rückwärts ab dem frühesten Frame aufsteigend
+        indices = list(range(center + 1, last + 1))
+        indices += list(range(max(center - behind, 0), center))
+        return indices
+
+    def _prefetch_loop(self):
+        reader = SequentialReader(self.video_path, index=self.index)
+        try:
+            while True:
+                with self._condition:
+                    while self._target is None and not self._stopped:
+                        self._condition.wait()
+                    if self._stopped:
+                        return
+                    center = self._target
+                    self._target = None
+
+                for idx in self._prefetch_indices(center):
+                    with self._condition:
+                        # Neues Ziel angefordert → aktuellen Durchlauf abbrechen
+                        if self._stopped or self._target is not None:
+                            break
+                    if self.cache.contains(idx):
+                        continue
+                    frame = reader.read(idx)
+                    if frame is not None:
+                        self.cache.put(idx, frame)
+        finally:
+            reader.release()
@@ -0,0 +1,105 @@
+# video/proxy_store.py - Verkleinerte Proxy-Frames als memory-mapped uint8-Array (einmal pro Video erzeugt)
+
+import json
+import os
+
+import cv2
+import numpy as np
+
+PROXY_VERSION = 1
+
+
+def proxy_paths(cache_dir: str, fingerprint: str, max_side: int):
+    base = os.path.join(cache_dir, f"{fingerprint}_{max_side}")
+    return base + ".u8", base + ".json"
+
+
+def proxy_size(width: int, height: int, max_side: int):
+    """(Breite, Höhe, Skalierung) des Proxys; kleinere Videos werden nicht hochskaliert."""
+    scale = min(max_side / max(width, height, 1), 1.0)
+    proxy_w = max(int(round(width * scale)), 1)
+    proxy_h = max(int(round(height * scale)), 1)
+    return proxy_w, proxy_h, proxy_w / max(width, 1)  # tatsächliche Skalierung nach dem Runden
+
+
+class ProxyStore:
+    """Alle Frames eines Videos in Proxy-Auflösung als (frames, h, w, 3) RGB-Array per np.memmap.
+
+    frame() liefert einen View in die gemappte Datei – kein Dekodieren, keine Kopie; das
+    Betriebssystem lädt nur die Seiten, die tatsächlich angezeigt werden.
+    """
+
+    def __init__(self, data_path: str, meta: dict):
+        self.data_path = data_path
+        self.frame_count = meta["frame_count"]
+        self.width = meta["width"]
+        self.height = meta["height"]
+        self.scale = meta["scale"]
+        self.frames = np.memmap(data_path, dtype=np.uint8, mode="r",
+                                shape=(self.frame_count, self.height, self.width, 3))
+
+    @classmethod
+    def open(cls, cache_dir: str, index, max_side: int):
+        """Vorhandenen Proxy laden; None, wenn (noch) keiner vollständig erzeugt wurde."""
+        data_path, meta_path = proxy_paths(cache_dir, index.fingerprint, max_side)
+        if not os.path.exists(meta_path) or not os.path.exists(data_path):
+            return None
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        if meta.get("version") != PROXY_VERSION or not meta["frame_count"]:
+            return None
+        return cls(data_path, meta)
+
+    @classmethod
+    def build(cls, video_path: str, cache_dir: str, index, max_side: int, progress_every: int = 0):
+        """Dekodiert das Video einmal sequentiell und schreibt jeden Frame verkleinert in die Datei."""
+        os.makedirs(cache_dir, exist_ok=True)
+        data_path, meta_path = proxy_paths(cache_dir, index.fingerprint, max_side)
+        width, height, scale = proxy_size(index.width, index.height, max_side)
+
+        tmp_path = data_path + ".tmp"
+        capacity = max(index.frame_count, 1)
+        frames = np.memmap(tmp_path, dtype=np.uint8, mode="w+", shape=(capacity, height, width, 3))
+
+        cap = cv2.VideoCapture(video_path)
+        count = 0
+        while count < capacity:
+            success, frame = cap.read()
+            if not success:
+                break
+            small = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+            cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=frames[count])
+            count += 1
+            if progress_every and count % progress_every == 0:
+                print(f"   Proxy: {count}/{capacity} Frames")
+        cap.release()
+        frames.flush()
+        del frames
+
+        # Weniger Frames dekodiert als erwartet → Datei auf den belegten Teil kürzen
+        if count < capacity:
+            with open(tmp_path, "r+b") as f:
+                f.truncate(count * height * width * 3)
+        os.replace(tmp_path, data_path)
+
+        meta = {"version": PROXY_VERSION, "frame_count": count, "width": width, "height": height, "scale": scale}
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + ".tmp", meta_path)  # Metadaten zuletzt → nur vollständige Proxys werden geöffnet
+        return cls(data_path, meta) if count else None
+
+    def frame(self, frame_index: int):
+        if not 0 <= frame_index < self.frame_count:
+            return None
+        return self.frames[frame_index]
+
+    # Leichtes Hochskalieren des Proxys (bis 15 %) ist unsichtbar genug und billiger als ein Vollbild-Dekodieren
+    UPSCALE_MARGIN = 1.15
+
+    def covers(self, zoom: float) -> bool:
+        """Reicht die Proxy-Auflösung für diese Zoomstufe (Bildpunkt → höchstens ~1,15 Bildschirmpixel)?"""
+        return zoom <= self.scale * self.UPSCALE_MARGIN
+
+    def close(self):
+        # Mapping wird freigegeben, sobald keine Views mehr darauf zeigen
+        self.frames = None
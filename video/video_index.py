@@ -0,0 +1,136 @@
+# video/video_index.py - Einmal erzeugter, auf Platte gecachter Index pro Video (Metadaten + Keyframes)
+
+import bisect
+import json
+import os
+import shutil
+import subprocess
+
+import cv2
+
+from video.fingerprint import file_fingerprint
+
+INDEX_VERSION = 2  # 2: ohne ffprobe keine geschätzten Anker mehr
+
+
+def probe_keyframes(video_path: str, timeout: float = 300.0):
+    """Exakte Frame-Anzahl und Keyframe-Positionen über ffprobe; None, wenn ffprobe fehlt oder scheitert.
+
+    Pakete kommen in Dekodier-Reihenfolge, daher nach pts sortieren → Index = Anzeige-Frame.
+    """
+    ffprobe = shutil.which("ffprobe")
+    if ffprobe is None:
+        return None
+
+    cmd = [ffprobe, "-v", "error", "-select_streams", "v:0",
+           "-show_entries", "packet=pts,flags", "-of", "csv=p=0", video_path]
+    try:
+        output = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=timeout).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    packets = []
+    for line in output.splitlines():
+        pts, _, flags = line.partition(",")
+        if not pts or pts == "N/A":
+            continue
+        packets.append((int(pts), "K" in flags))
+    if not packets:
+        return None
+
+    packets.sort()
+    keyframes = [i for i, (_, key) in enumerate(packets) if key]
+    return len(packets), keyframes
+
+
+class VideoIndex:
+    """Frame-Anzahl, FPS, Auflösung, Keyframes und Inhalts-Hash eines Videos.
+
+    keyframes_exact=False heißt: kein ffprobe verfügbar. Dann ist nur Frame 0 als Keyframe bekannt –
+    Rücksprünge dekodieren von vorne (langsam, aber frame-genau), statt einem geratenen Anker per
+    CAP_PROP_POS_FRAMES zu vertrauen.
+    """
+
+    def __init__(self, video_path, fingerprint, frame_count, fps, width, height, keyframes, keyframes_exact):
+        self.video_path = video_path
+        self.fingerprint = fingerprint
+        self.frame_count = frame_count
+        self.fps = fps
+        self.width = width
+        self.height = height
+        self.keyframes = keyframes or [0]
+        self.keyframes_exact = keyframes_exact
+
+    @classmethod
+    def build(cls, video_path: str) -> "VideoIndex":
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise IOError(f"Video kann nicht geöffnet werden: {video_path}")
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        cap.release()
+
+        probed = probe_keyframes(video_path)
+        if probed is not None:
+            frame_count, keyframes = probed  # Paketanzahl ist genauer als CAP_PROP_FRAME_COUNT
+            exact = True
+        else:
+            print(f"⚠️ ffprobe nicht verfügbar oder fehlgeschlagen für {video_path}: keine Keyframe-Daten, "
+                  f"Sprünge dekodieren ab Frame 0 (ffprobe installieren für schnelle, genaue Seeks)")
+            keyframes = [0]
+            exact = False
+
+        return cls(video_path, file_fingerprint(video_path), frame_count, fps, width, height, keyframes, exact)
+
+    @classmethod
+    def open(cls, video_path: str, cache_dir: str | None = None) -> "VideoIndex":
+        """Lädt den Index aus cache_dir (Schlüssel = Inhalts-Hash) oder baut und speichert ihn."""
+        if cache_dir is None:
+            return cls.build(video_path)
+
+        path = os.path.join(cache_dir, f"{file_fingerprint(video_path)}.json")
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                return cls.from_dict(video_path, data)
+
+        index = cls.build(video_path)
+        index.save(path)
+        return index
+
+    def keyframe_before(self, frame_index: int) -> int:
+        """Letzter Keyframe <= frame_index."""
+        pos = bisect.bisect_right(self.keyframes, frame_index) - 1
+        return self.keyframes[max(pos, 0)]
+
+    def max_decode_distance(self) -> int:
+        """Obergrenze für die Frames, die nach einem Seek vorwärts dekodiert werden müssen (= längste GOP)."""
+        bounds = self.keyframes + [max(self.frame_count, self.keyframes[-1] + 1)]
+        return max(b - a for a, b in zip(bounds[:-1], bounds[1:]))
+
+    def to_dict(self) -> dict:
+        return {
+            "version": INDEX_VERSION,
+            "fingerprint": self.fingerprint,
+            "frame_count": self.frame_count,
+            "fps": self.fps,
+            "width": self.width,
+            "height": self.height,
+            "keyframes": self.keyframes,
+            "keyframes_exact": self.keyframes_exact,
+        }
+
+    @classmethod
+    def from_dict(cls, video_path: str, data: dict) -> "VideoIndex":
+        return cls(video_path, data["fingerprint"], data["frame_count"], data["fps"], data["width"],
+                   data["height"], data["keyframes"], data["keyframes_exact"])
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)